@@ -1,25 +1,80 @@
+import io
 import os
+import re
+import sys
 import json
+import math
+import time
+import uuid
+import zlib
+import hashlib
+import mimetypes
+import zipfile
+import unicodedata
+import sqlite3
+import queue
+import atexit
+import random
+import threading
 import requests
-from datetime import datetime
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session
+from requests.adapters import HTTPAdapter
+from collections import Counter, OrderedDict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from xml.etree import ElementTree
+from flask import Flask, Response, g, render_template, request, jsonify, redirect, url_for, session, send_from_directory, stream_with_context, has_request_context
 from flask_cors import CORS
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session as OrmSession
+from werkzeug.exceptions import RequestEntityTooLarge
 from authlib.integrations.flask_client import OAuth
-from groq import Groq
+from groq import Groq, RateLimitError
 from dotenv import load_dotenv
+from pypdf import PdfReader
+import functools
 from functools import wraps
+from contextlib import closing, contextmanager
 
 load_dotenv()
 
 app = Flask(__name__)
 app.secret_key = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///hirevoid.db'
+def database_config():
+    """SQLAlchemy URI and engine options from DATABASE_URL (SQLite by default)"""
+    uri = os.getenv("DATABASE_URL", "sqlite:///hirevoid.db")
+    # requirements.txt ships psycopg2; name it so newer SQLAlchemy doesn't default to psycopg 3
+    for scheme in ("postgres://", "postgresql://"):
+        if uri.startswith(scheme):
+            uri = "postgresql+psycopg2://" + uri[len(scheme):]
+    if uri.startswith("sqlite"):
+        return uri, {'connect_args': {'timeout': 15}}
+    return uri, {
+        'pool_size': int(os.getenv("DB_POOL_SIZE", "5")),
+        'max_overflow': int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        'pool_timeout': int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        'pool_recycle': 1800,
+        'pool_pre_ping': True,
+    }
+
+app.config['SQLALCHEMY_DATABASE_URI'], app.config['SQLALCHEMY_ENGINE_OPTIONS'] = database_config()
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 CORS(app)
 db = SQLAlchemy(app)
+
+@event.listens_for(Engine, "connect")
+def configure_sqlite(dbapi_connection, connection_record):
+    """WAL lets readers run alongside the single writer; busy_timeout waits out lock contention"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'index'
@@ -60,6 +115,334 @@ linkedin = oauth.register(
     client_kwargs={'scope': 'r_liteprofile r_emailaddress'},
 )
 
+# ============================================
+# METRICS AND STRUCTURED LOGGING
+# ============================================
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+def _label_text(labels):
+    if not labels:
+        return ''
+    escaped = (
+        f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34)).replace(chr(10), " ")}"'
+        for k, v in labels
+    )
+    return '{' + ','.join(escaped) + '}'
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values, Prometheus style"""
+
+    def __init__(self, name, help_text, label_names, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self.series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.label_names)
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['counts'][i] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(key, dict(series, counts=list(series['counts']))) for key, series in self.series.items()]
+        for key, series in items:
+            labels = list(zip(self.label_names, key))
+            for bound, count in zip(self.buckets, series['counts']):
+                lines.append(f"{self.name}_bucket{_label_text(labels + [('le', bound)])} {count}")
+            lines.append(f"{self.name}_bucket{_label_text(labels + [('le', '+Inf')])} {series['count']}")
+            lines.append(f"{self.name}_sum{_label_text(labels)} {series['sum']}")
+            lines.append(f"{self.name}_count{_label_text(labels)} {series['count']}")
+        return lines
+
+class MetricsRegistry:
+    """Histograms observed inline plus collectors read at scrape time.
+
+    A collector returns (name, type, help, [(labels_dict, value), ...])
+    tuples built from counters the app already keeps (caches, queues).
+    """
+
+    def __init__(self):
+        self.histograms = []
+        self.collectors = []
+
+    def histogram(self, name, help_text, label_names, buckets=LATENCY_BUCKETS):
+        histogram = Histogram(name, help_text, label_names, buckets)
+        self.histograms.append(histogram)
+        return histogram
+
+    def collector(self, fn):
+        self.collectors.append(fn)
+        return fn
+
+    def render(self):
+        lines = []
+        for histogram in self.histograms:
+            lines.extend(histogram.render())
+        for collect in self.collectors:
+            for name, kind, help_text, samples in collect():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_label_text(sorted(labels.items()))} {value}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+request_seconds = metrics.histogram(
+    'hirevoid_http_request_duration_seconds', 'Flask request handling time', ('route', 'method', 'status'))
+upstream_seconds = metrics.histogram(
+    'hirevoid_upstream_request_duration_seconds', 'Outbound call latency per attempt', ('upstream', 'outcome'))
+groq_model_seconds = metrics.histogram(
+    'hirevoid_groq_model_seconds', 'Groq-reported model time (queue + prompt + completion)', ('endpoint',))
+groq_tokens_per_second = metrics.histogram(
+    'hirevoid_groq_completion_tokens_per_second', 'Groq completion throughput', ('endpoint',),
+    buckets=(25, 50, 100, 200, 300, 500, 750, 1000, 1500, 2000))
+db_commit_seconds = metrics.histogram(
+    'hirevoid_db_commit_duration_seconds', 'SQLAlchemy session commit time including flush', ())
+
+def current_request_id():
+    return g.get('request_id') if has_request_context() else None
+
+_log_lock = threading.Lock()
+
+def log(message, level='info', **fields):
+    """Write one JSON log line to stdout, tagged with the current request ID"""
+    record = {'ts': datetime.utcnow().isoformat(timespec='milliseconds') + 'Z', 'level': level, 'msg': message}
+    request_id = current_request_id()
+    if request_id:
+        record['requestId'] = request_id
+    record.update(fields)
+    line = json.dumps(record, default=str) + "\n"
+    # One locked write per record so lines from concurrent threads never interleave
+    with _log_lock:
+        sys.stdout.write(line)
+        sys.stdout.flush()
+
+@app.before_request
+def start_request_timer():
+    g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    started = g.pop('request_started', None)
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    request_seconds.observe(elapsed, route=route, method=request.method, status=response.status_code)
+    response.headers['X-Request-ID'] = g.request_id
+    if route != '/metrics':
+        log('request', method=request.method, route=route, status=response.status_code,
+            durationMs=round(elapsed * 1000, 1))
+    return response
+
+@event.listens_for(OrmSession, "before_commit")
+def start_commit_timer(session):
+    session.info['commit_started'] = time.perf_counter()
+
+@event.listens_for(OrmSession, "after_commit")
+def record_commit_time(session):
+    started = session.info.pop('commit_started', None)
+    if started is not None:
+        db_commit_seconds.observe(time.perf_counter() - started)
+
+@event.listens_for(OrmSession, "after_rollback")
+def clear_commit_timer(session):
+    session.info.pop('commit_started', None)
+
+# ============================================
+# OUTBOUND HTTP CLIENT
+# ============================================
+
+class UpstreamUnavailable(requests.exceptions.RequestException):
+    """Raised when an upstream's circuit breaker is open"""
+
+class CircuitBreaker:
+    """Opens after consecutive failures and lets one trial call through after a cooldown"""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.time() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state != 'half-open':
+                return state == 'closed'
+            # One probe at a time; a probe that never reported back is replaced after the cooldown
+            now = time.time()
+            if self.probe_started is not None and now - self.probe_started < self.reset_timeout:
+                return False
+            self.probe_started = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probe_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.probe_started is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.time()
+                self.probe_started = None
+
+class UpstreamStats:
+    """Call counters and a rolling latency window for one upstream"""
+
+    def __init__(self, window=500):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, elapsed, ok):
+        with self._lock:
+            self.calls += 1
+            if not ok:
+                self.errors += 1
+            self.latencies.append(elapsed)
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def snapshot(self):
+        with self._lock:
+            ordered = sorted(self.latencies)
+            calls, errors, retries = self.calls, self.errors, self.retries
+
+        def pct(q):
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 1) if ordered else None
+
+        return {
+            'calls': calls,
+            'errors': errors,
+            'retries': retries,
+            'p50Ms': pct(0.50),
+            'p95Ms': pct(0.95),
+            'maxMs': round(ordered[-1] * 1000, 1) if ordered else None
+        }
+
+class UpstreamClient:
+    """Shared requests.Session for every outbound call.
+
+    Keeps pooled keep-alive connections, applies per-upstream timeouts,
+    retries 429/5xx with jittered exponential backoff and trips a circuit
+    breaker per upstream so a dead dependency fails fast.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, timeouts=None, max_retries=2, backoff=0.5, pool_size=20, max_retry_wait=10):
+        self.timeouts = timeouts or {}
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_retry_wait = max_retry_wait
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.breakers = {}
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def _upstream(self, name):
+        with self._lock:
+            if name not in self.breakers:
+                self.breakers[name] = CircuitBreaker()
+                self.stats[name] = UpstreamStats()
+            return self.breakers[name], self.stats[name]
+
+    def _retry_delay(self, attempt, response=None):
+        """Jittered backoff, never sooner than Retry-After; None when the wait would exceed max_retry_wait"""
+        delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, int(retry_after) + random.uniform(0, self.backoff))
+        return delay if delay <= self.max_retry_wait else None
+
+    def request(self, method, url, upstream, **kwargs):
+        breaker, stats = self._upstream(upstream)
+        if not breaker.allow():
+            raise UpstreamUnavailable(f"{upstream} circuit open")
+        kwargs.setdefault('timeout', self.timeouts.get(upstream, (3.05, 15)))
+
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                stats.record(time.perf_counter() - start, ok=False)
+                upstream_seconds.observe(time.perf_counter() - start, upstream=upstream, outcome=type(e).__name__)
+                breaker.record_failure()
+                delay = self._retry_delay(attempt)
+                if attempt == self.max_retries or delay is None or not breaker.allow():
+                    raise
+                stats.record_retry()
+                time.sleep(delay)
+                continue
+
+            ok = response.status_code not in self.RETRY_STATUSES
+            stats.record(time.perf_counter() - start, ok=ok)
+            upstream_seconds.observe(time.perf_counter() - start, upstream=upstream, outcome=response.status_code)
+            if ok:
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+            delay = self._retry_delay(attempt, response)
+            if attempt == self.max_retries or delay is None or not breaker.allow():
+                return response
+            stats.record_retry()
+            time.sleep(delay)
+
+    def get(self, url, upstream, **kwargs):
+        return self.request('GET', url, upstream, **kwargs)
+
+    def snapshot(self):
+        with self._lock:
+            names = list(self.stats)
+        return {
+            name: dict(self.stats[name].snapshot(), circuit=self.breakers[name].state)
+            for name in names
+        }
+
+http_client = UpstreamClient(
+    timeouts={
+        'jsearch': (3.05, float(os.getenv("JSEARCH_READ_TIMEOUT", "20"))),
+        'linkedin': (3.05, 10),
+    },
+    max_retries=int(os.getenv("UPSTREAM_MAX_RETRIES", "2")),
+    max_retry_wait=float(os.getenv("UPSTREAM_MAX_RETRY_WAIT", "10"))
+)
+
 # Database Models
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -75,41 +458,929 @@ class User(UserMixin, db.Model):
         return f'<User {self.email}>'
 
 class SavedAnalysis(db.Model):
+    __table_args__ = (
+        db.Index('ix_saved_analysis_user_created', 'user_id', 'created_at', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     analysis_type = db.Column(db.String(50))
     data = db.Column(db.Text)
+    summary = db.Column(db.Text)
+    storage = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     user = db.relationship('User', backref=db.backref('analyses', lazy=True))
+    blobs = db.relationship('ContentBlob', secondary='analysis_blob', lazy=True)
+
+class ContentBlob(db.Model):
+    """zlib-compressed input text (resumes, JDs), stored once per SHA-256"""
+    hash = db.Column(db.String(64), primary_key=True)
+    data = db.Column(db.LargeBinary, nullable=False)
+    size = db.Column(db.Integer)
+
+class ParsedResume(db.Model):
+    """Uploaded resume file parsed once, keyed by SHA-256 of the file bytes"""
+    hash = db.Column(db.String(64), primary_key=True)
+    text_hash = db.Column(db.String(64), db.ForeignKey('content_blob.hash'), nullable=False)
+    skills = db.Column(db.Text)
+    filename = db.Column(db.String(255))
+    file_type = db.Column(db.String(10))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    text_blob = db.relationship('ContentBlob')
+    users = db.relationship('User', secondary='user_resume', lazy=True,
+                            backref=db.backref('resumes', lazy=True))
+
+user_resume = db.Table(
+    'user_resume',
+    db.Column('user_id', db.Integer, db.ForeignKey('user.id'), primary_key=True),
+    db.Column('resume_hash', db.String(64), db.ForeignKey('parsed_resume.hash'), primary_key=True)
+)
+
+class AnalysisJob(db.Model):
+    """Background run of an analysis or job search, polled via /api/jobs/<id>"""
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'idempotency_key', name='uq_analysis_job_idempotency'),
+        db.Index('ix_analysis_job_created', 'created_at'),
+    )
+
+    id = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    endpoint = db.Column(db.String(50), nullable=False)
+    idempotency_key = db.Column(db.String(128))
+    request_hash = db.Column(db.String(64), nullable=False)
+    status = db.Column(db.String(16), nullable=False, default='queued')
+    status_code = db.Column(db.Integer)
+    response = db.Column(db.Text)
+    retry_after = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+analysis_blob = db.Table(
+    'analysis_blob',
+    db.Column('analysis_id', db.Integer, db.ForeignKey('saved_analysis.id'), primary_key=True),
+    db.Column('blob_hash', db.String(64), db.ForeignKey('content_blob.hash'), primary_key=True, index=True)
+)
+
+# SavedAnalysis.storage: None = raw JSON, 2 = large inputs moved to ContentBlob
+BLOB_STORAGE_VERSION = 2
+BLOB_MIN_SIZE = 256
+
+def get_or_create_blob(text):
+    raw = text.encode('utf-8')
+    digest = hashlib.sha256(raw).hexdigest()
+    blob = db.session.get(ContentBlob, digest)
+    if blob is None:
+        blob = ContentBlob(hash=digest, data=zlib.compress(raw, 6), size=len(raw))
+        db.session.add(blob)
+    return blob
+
+def pack_analysis(analysis, data, result):
+    """Fill analysis.data, moving large input strings (also inside lists) into shared blobs"""
+    blobs = []
+
+    def pack(value):
+        if isinstance(value, str) and len(value) >= BLOB_MIN_SIZE:
+            blob = get_or_create_blob(value)
+            if blob not in blobs:
+                blobs.append(blob)
+            return {'$blob': blob.hash}
+        if isinstance(value, list):
+            return [pack(item) for item in value]
+        return value
+
+    packed_input = {key: pack(value) for key, value in (data or {}).items()}
+    analysis.data = json.dumps({'input': packed_input, 'output': result})
+    analysis.blobs = blobs
+    analysis.storage = BLOB_STORAGE_VERSION
+
+def _is_blob_ref(value):
+    return isinstance(value, dict) and '$blob' in value
 
-# Create tables
-with app.app_context():
+def unpack_analysis_data(text):
+    """Inverse of pack_analysis: the stored JSON with blob references expanded"""
+    payload = json.loads(text)
+    packed_input = payload.get('input') or {}
+
+    refs = set()
+    def collect(value):
+        if _is_blob_ref(value):
+            refs.add(value['$blob'])
+        elif isinstance(value, list):
+            for item in value:
+                collect(item)
+    for value in packed_input.values():
+        collect(value)
+    if not refs:
+        return payload
+
+    # Plain column rows: loading ContentBlob entities costs more than decompressing them
+    texts = {
+        digest: zlib.decompress(data).decode('utf-8')
+        for digest, data in db.session.query(ContentBlob.hash, ContentBlob.data).filter(ContentBlob.hash.in_(refs))
+    }
+    def expand(value):
+        if _is_blob_ref(value):
+            return texts.get(value['$blob'])
+        if isinstance(value, list):
+            return [expand(item) for item in value]
+        return value
+    payload['input'] = {key: expand(value) for key, value in packed_input.items()}
+    return payload
+
+def delete_orphan_blobs(hashes):
+    """Delete the blobs among hashes that nothing references any more.
+
+    The reference check runs inside the DELETE itself, so a link committed
+    by the write-behind writer in the meantime keeps its blob.
+    """
+    if not hashes:
+        return
+    db.session.execute(
+        ContentBlob.__table__.delete().where(
+            ContentBlob.hash.in_(hashes),
+            ~db.exists().where(analysis_blob.c.blob_hash == ContentBlob.hash),
+            ~db.exists().where(ParsedResume.text_hash == ContentBlob.hash)
+        )
+    )
+
+def summarize_analysis(analysis_type, data, result):
+    """Small precomputed summary shown in history lists without loading the full payload"""
+    data = data or {}
+    result = result or {}
+    if analysis_type == 'resume':
+        return {'rating': result.get('rating')}
+    if analysis_type == 'match':
+        return {'score': result.get('score'), 'verdict': result.get('verdict')}
+    if analysis_type == 'match_batch':
+        scores = [r['score'] for r in result.get('results', []) if isinstance(r.get('score'), (int, float))]
+        return {'count': len(result.get('results', [])), 'bestScore': max(scores) if scores else None}
+    if analysis_type == 'jd':
+        overview = result.get('overview') or ''
+        return {'overview': overview[:140] if isinstance(overview, str) else ''}
+    if analysis_type == 'jobs':
+        return {
+            'role': data.get('role'),
+            'location': data.get('location'),
+            'count': len(result.get('jobs', []))
+        }
+    return {}
+
+SCHEMA_COLUMNS = [
+    ('saved_analysis', 'summary', 'TEXT'),
+    ('saved_analysis', 'storage', 'INTEGER'),
+    ('analysis_job', 'retry_after', 'INTEGER'),
+]
+
+def upgrade_schema():
+    """Create tables and bring databases created by older versions up to date"""
     db.create_all()
+    inspector = db.inspect(db.engine)
+    for table, column, ddl in SCHEMA_COLUMNS:
+        if column not in {c['name'] for c in inspector.get_columns(table)}:
+            with db.engine.begin() as conn:
+                conn.execute(db.text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
 
-@login_manager.user_loader
-def load_user(user_id):
-    return User.query.get(int(user_id))
+    for analysis in SavedAnalysis.query.filter(SavedAnalysis.summary.is_(None)).all():
+        payload = json.loads(analysis.data)
+        analysis.summary = json.dumps(summarize_analysis(
+            analysis.analysis_type, payload.get('input'), payload.get('output')
+        ))
+    db.session.commit()
+
+    migrate_analysis_storage()
+
+    existing_indexes = {i['name'] for i in inspector.get_indexes('saved_analysis')}
+    for index in SavedAnalysis.__table__.indexes:
+        if index.name not in existing_indexes:
+            index.create(db.engine)
+
+def migrate_analysis_storage(batch_size=200):
+    """Move inputs of rows saved before blob storage into ContentBlob"""
+    while True:
+        batch = SavedAnalysis.query.filter(SavedAnalysis.storage.is_(None)).limit(batch_size).all()
+        if not batch:
+            return
+        for analysis in batch:
+            payload = json.loads(analysis.data)
+            pack_analysis(analysis, payload.get('input'), payload.get('output'))
+        db.session.commit()
+
+@app.cli.command('upgrade-db')
+def upgrade_db_command():
+    """Create or upgrade the database schema"""
+    upgrade_schema()
+    print("Database schema is up to date.")
 
 # Groq Client
 client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 MODEL = "llama-3.3-70b-versatile"
 
-def get_groq_json(system_prompt, user_prompt):
+# ============================================
+# RESULT CACHES
+# ============================================
+
+class ResultCache:
+    """Content-addressed cache for upstream results (Groq JSON, JSearch listings).
+
+    An in-memory LRU tier sits in front of an optional SQLite tier. The
+    SQLite tier survives restarts and is shared by all gunicorn workers
+    pointing at the same file.
+    """
+
+    # Expired SQLite rows are purged once every this many persistent writes
+    PURGE_EVERY = 500
+
+    def __init__(self, name, max_entries=512, ttl=86400, db_path=None):
+        self.name = name
+        self.table = f"{name}_cache"
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._table_ready = False
+        self._writes = 0
+
+    def _connect(self):
+        # The file and table are created on first use, not at import
+        if not self._table_ready:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        if not self._table_ready:
+            with conn:
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+            self._table_ready = True
+        return conn
+
+    @staticmethod
+    def make_key(*parts):
+        normalized = [" ".join(str(p).split()) for p in parts]
+        return hashlib.sha256(json.dumps(normalized).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self._entries[key]
+
+        value = self._get_persistent(key, now)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, value, now + self.ttl)
+        return value
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._store(key, value, expires_at)
+        if self.db_path:
+            try:
+                with closing(self._connect()) as conn, conn:
+                    conn.execute(
+                        f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(value), expires_at)
+                    )
+                    self._writes += 1
+                    if self._writes % self.PURGE_EVERY == 0:
+                        conn.execute(f"DELETE FROM {self.table} WHERE expires_at < ?", (time.time(),))
+            except sqlite3.Error as e:
+                log('Cache write failed', level='error', cache=self.name, error=str(e))
+
+    def _store(self, key, value, expires_at):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _get_persistent(self, key, now):
+        if not self.db_path:
+            return None
+        try:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute(
+                    f"SELECT value FROM {self.table} WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+        except sqlite3.Error as e:
+            log('Cache read failed', level='error', cache=self.name, error=str(e))
+            return None
+        return json.loads(row[0]) if row else None
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'hitRatio': round(self.hits / total, 4) if total else 0.0
+            }
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one in-flight call"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {'event': threading.Event(), 'result': None, 'error': None}
+                self._calls[key] = call
+
+        if not leader:
+            call['event'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+
+        try:
+            call['result'] = fn()
+            return call['result']
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['event'].set()
+
+llm_cache = ResultCache(
+    'llm',
+    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512")),
+    ttl=int(os.getenv("LLM_CACHE_TTL", "86400")),
+    db_path=os.getenv("LLM_CACHE_DB") or None
+)
+
+jobs_cache = ResultCache(
+    'jsearch',
+    max_entries=int(os.getenv("JOB_CACHE_MAX_ENTRIES", "256")),
+    ttl=int(os.getenv("JOB_CACHE_TTL", "1800")),
+    db_path=os.getenv("LLM_CACHE_DB") or None
+)
+jobs_flight = SingleFlight()
+
+# ============================================
+# SESSION USERS
+# ============================================
+
+IDENTITY_FIELDS = ('id', 'email', 'name', 'avatar', 'provider')
+
+# Identity fields per (user id, session identity version); a short TTL bounds
+# how long other sessions of the same user see fields changed at sign-in
+user_cache = ResultCache(
+    'user',
+    max_entries=int(os.getenv("USER_CACHE_MAX_ENTRIES", "1024")),
+    ttl=int(os.getenv("USER_CACHE_TTL", "60"))
+)
+
+class SessionUser(UserMixin):
+    """current_user built from cached identity fields, without a User row behind it.
+
+    Views that need the ORM object should load it with db.session.get(User, id).
+    """
+
+    def __init__(self, id, email, name, avatar, provider):
+        self.id = id
+        self.email = email
+        self.name = name
+        self.avatar = avatar
+        self.provider = provider
+
+def user_identity(user):
+    return {field: getattr(user, field) for field in IDENTITY_FIELDS}
+
+def identity_cache_key(user_id):
+    return user_cache.make_key(user_id, session.get('identity_version'))
+
+@login_manager.user_loader
+def load_user(user_id):
+    key = identity_cache_key(user_id)
+    identity = user_cache.get(key)
+    if identity is None:
+        user = db.session.get(User, int(user_id))
+        if user is None:
+            return None
+        identity = user_identity(user)
+        user_cache.set(key, identity)
+    return SessionUser(**identity)
+
+def sign_in(user):
+    """login_user with a new identity version, so every worker reloads this session's user fields"""
+    login_user(user)
+    session['identity_version'] = uuid.uuid4().hex
+    user_cache.set(identity_cache_key(user.id), user_identity(user))
+
+# ============================================
+# PROMPT COMPACTION AND TOKEN ACCOUNTING
+# ============================================
+
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "3000"))
+JD_TOKEN_BUDGET = int(os.getenv("JD_TOKEN_BUDGET", "2000"))
+CHARS_PER_TOKEN = 4
+
+# "Page 3", "Page 3 of 5", "3 of 5", "3/5", "- 3 -"; bare numbers and years are content
+PAGE_NUMBER_RE = re.compile(r"^(?:page\s*\d+(?:\s*(?:of|/)\s*\d+)?|\d+\s*(?:of|/)\s*\d+|-\s*\d+\s*-)$", re.I)
+INLINE_SPACE_RE = re.compile(r"[ \t\u00a0]+")
+# Short lines repeated this often are running headers/footers (name, contact line, URL)
+HEADER_MIN_REPEATS = 3
+HEADER_MAX_LENGTH = 80
+
+def estimate_tokens(text):
+    """Cheap local estimate of Llama tokens (~4 characters per token for English text)"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def compact_text(text):
+    """Normalize PDF-extracted text: collapse whitespace, drop page numbers and
+    repeated header/footer lines, and squeeze blank lines.
+
+    Only the first occurrence of a short line seen HEADER_MIN_REPEATS or
+    more times is kept; lines that repeat less often are left alone.
+    """
+    raw_lines = [INLINE_SPACE_RE.sub(' ', line).strip() for line in (text or '').splitlines()]
+    counts = Counter(line.lower() for line in raw_lines if line and len(line) <= HEADER_MAX_LENGTH)
+    repeated = {line for line, n in counts.items() if n >= HEADER_MIN_REPEATS}
+
+    lines = []
+    seen = set()
+    blank = False
+    for line in raw_lines:
+        if not line:
+            if lines and not blank:
+                lines.append('')
+            blank = True
+            continue
+        if PAGE_NUMBER_RE.match(line):
+            continue
+        key = line.lower()
+        if key in repeated:
+            if key in seen:
+                continue
+            seen.add(key)
+        lines.append(line)
+        blank = False
+    return "\n".join(lines).strip()
+
+# A line break is only used as the cut point if it keeps this share of the budget
+TRUNCATE_LINE_SLACK = 0.15
+
+def prepare_prompt_text(text, token_budget):
+    """compact_text trimmed to a token budget.
+
+    Cuts at the last line break when it falls near the limit, otherwise at
+    the last space: pdf.js output puts a whole page on one line.
+    """
+    text = compact_text(text)
+    if estimate_tokens(text) <= token_budget:
+        return text
+    limit = token_budget * CHARS_PER_TOKEN
+    floor = int(limit * (1 - TRUNCATE_LINE_SLACK))
+    cut = text.rfind("\n", floor, limit)
+    if cut <= 0:
+        cut = text.rfind(" ", floor, limit)
+    if cut <= 0:
+        cut = limit
+    return text[:cut].rstrip() + "\n[truncated]"
+
+class TokenUsage:
+    """Prompt/completion token totals per endpoint, from Groq's usage reports"""
+
+    def __init__(self):
+        self.endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, label, usage):
+        if usage is None:
+            return
+        prompt = getattr(usage, 'prompt_tokens', 0) or 0
+        completion = getattr(usage, 'completion_tokens', 0) or 0
+        with self._lock:
+            totals = self.endpoints.setdefault(label, {'requests': 0, 'promptTokens': 0, 'completionTokens': 0})
+            totals['requests'] += 1
+            totals['promptTokens'] += prompt
+            totals['completionTokens'] += completion
+        model_time = getattr(usage, 'total_time', None)
+        completion_time = getattr(usage, 'completion_time', None)
+        if model_time:
+            groq_model_seconds.observe(model_time, endpoint=label)
+        if completion and completion_time:
+            groq_tokens_per_second.observe(completion / completion_time, endpoint=label)
+        log('groq usage', endpoint=label, promptTokens=prompt, completionTokens=completion, modelSeconds=model_time)
+
+    def snapshot(self):
+        with self._lock:
+            return {label: dict(totals) for label, totals in self.endpoints.items()}
+
+token_usage = TokenUsage()
+
+def _usage_label(label):
+    if label:
+        return label
+    return request.endpoint if has_request_context() else 'unknown'
+
+def get_groq_json(system_prompt, user_prompt, label=None):
+    cache_key = llm_cache.make_key(MODEL, system_prompt, user_prompt)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    result = _call_groq_json(system_prompt, user_prompt, _usage_label(label))
+    if result is not None:
+        llm_cache.set(cache_key, result)
+    return result
+
+class RateLimitGate:
+    """Shared pause for every caller in this worker after an upstream 429"""
+
+    def __init__(self):
+        self.resume_at = 0.0
+
+    def trip(self, seconds):
+        self.resume_at = max(self.resume_at, time.time() + seconds)
+
+    @property
+    def tripped(self):
+        return self.resume_at > time.time()
+
+    def wait(self):
+        delay = self.resume_at - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+groq_gate = RateLimitGate()
+
+def _retry_after(error, default=5.0):
     try:
-        completion = client.chat.completions.create(
-            model=MODEL,
-            messages=[
-                {"role": "system", "content": f"{system_prompt} Respond ONLY in valid JSON."},
-                {"role": "user", "content": user_prompt}
-            ],
-            response_format={"type": "json_object"}
-        )
+        return float(error.response.headers.get('retry-after', default))
+    except (AttributeError, TypeError, ValueError):
+        return default
+
+def _call_groq_json(system_prompt, user_prompt, label):
+    groq_gate.wait()
+    try:
+        with upstream_slot('groq'):
+            start = time.perf_counter()
+            completion = client.chat.completions.create(
+                model=MODEL,
+                messages=[
+                    {"role": "system", "content": f"{system_prompt} Respond ONLY in valid JSON."},
+                    {"role": "user", "content": user_prompt}
+                ],
+                response_format={"type": "json_object"}
+            )
+            upstream_seconds.observe(time.perf_counter() - start, upstream='groq', outcome='ok')
+        token_usage.record(label, completion.usage)
         return json.loads(completion.choices[0].message.content)
+    except AdmissionRejected:
+        raise
+    except RateLimitError as e:
+        groq_gate.trip(_retry_after(e))
+        upstream_seconds.observe(time.perf_counter() - start, upstream='groq', outcome='rate_limited')
+        log('Groq rate limited', level='warning', error=str(e))
+        return None
     except Exception as e:
-        print(f"Error: {e}")
+        log('Groq request failed', level='error', error=str(e))
         return None
 
+# ============================================
+# STREAMING (SSE) ANALYSIS
+# ============================================
+
+class IncrementalJSONParser:
+    """Emits top-level members of a JSON object as soon as they are complete.
+
+    Feed it raw text chunks from a streamed completion; each call to feed()
+    returns the (key, value) pairs whose values were closed by that chunk.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.member_start = None
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        members = []
+        while self.pos < len(self.buffer):
+            char = self.buffer[self.pos]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == '\\':
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in '{[':
+                self.depth += 1
+                if self.depth == 1 and char == '{':
+                    self.member_start = self.pos + 1
+            elif char in '}]':
+                self.depth -= 1
+                if self.depth == 0:
+                    members.extend(self._take_member())
+            elif char == ',' and self.depth == 1:
+                members.extend(self._take_member())
+                self.member_start = self.pos + 1
+            self.pos += 1
+        return members
+
+    def _take_member(self):
+        if self.member_start is None:
+            return []
+        segment = self.buffer[self.member_start:self.pos].strip()
+        if not segment:
+            return []
+        try:
+            return list(json.loads("{" + segment + "}").items())
+        except ValueError:
+            return []
+
+    def result(self):
+        text = self.buffer
+        start, end = text.find('{'), text.rfind('}')
+        if start == -1 or end == -1:
+            return None
+        try:
+            return json.loads(text[start:end + 1])
+        except ValueError:
+            return None
+
+def sse_event(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+def stream_groq_json(system_prompt, user_prompt, label=None):
+    """Yield ('field', (key, value)) pairs as they arrive, then ('done', result).
+
+    Groq's JSON mode does not support streaming, so the streamed call relies
+    on the system prompt for JSON output and the full text is validated at
+    the end. Cached results are replayed without calling the model.
+    """
+    cache_key = llm_cache.make_key(MODEL, system_prompt, user_prompt)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        for key, value in cached.items():
+            yield 'field', (key, value)
+        yield 'done', cached
+        return
+
+    label = _usage_label(label)
+    parser = IncrementalJSONParser()
+    groq_gate.wait()
+    try:
+        with upstream_slot('groq'):
+            start = time.perf_counter()
+            stream = client.chat.completions.create(
+                model=MODEL,
+                messages=[
+                    {"role": "system", "content": f"{system_prompt} Respond ONLY in valid JSON."},
+                    {"role": "user", "content": user_prompt}
+                ],
+                stream=True
+            )
+            for chunk in stream:
+                # Groq reports usage on the final chunk under x_groq
+                usage = getattr(getattr(chunk, 'x_groq', None), 'usage', None)
+                if usage is not None:
+                    token_usage.record(label, usage)
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    for member in parser.feed(delta):
+                        yield 'field', member
+            upstream_seconds.observe(time.perf_counter() - start, upstream='groq', outcome='ok')
+    except RateLimitError as e:
+        groq_gate.trip(_retry_after(e))
+        log('Groq rate limited', level='warning', error=str(e))
+        yield 'done', None
+        return
+    except AdmissionRejected:
+        raise
+    except Exception as e:
+        log('Groq streaming failed', level='error', error=str(e))
+        yield 'done', None
+        return
+
+    result = parser.result()
+    if result is not None:
+        llm_cache.set(cache_key, result)
+    yield 'done', result
+
+def wants_stream():
+    return (request.args.get('stream') in ('1', 'true')
+            or 'text/event-stream' in request.headers.get('Accept', ''))
+
+def write_analyses(records):
+    """Insert SavedAnalysis records in a single transaction; returns how many were written"""
+    for attempt in range(2):
+        try:
+            for record in records:
+                analysis = SavedAnalysis(
+                    user_id=record['user_id'],
+                    analysis_type=record['analysis_type'],
+                    created_at=record['created_at'],
+                    summary=json.dumps(summarize_analysis(
+                        record['analysis_type'], record['data'], record['result']
+                    ))
+                )
+                pack_analysis(analysis, record['data'], record['result'])
+                db.session.add(analysis)
+            db.session.commit()
+            return len(records)
+        except IntegrityError as e:
+            # Another worker stored the same blob first; retry to reference it
+            db.session.rollback()
+            if attempt:
+                log('Saving analysis failed', level='error', error=str(e))
+        except Exception as e:
+            db.session.rollback()
+            log('Saving analysis failed', level='error', error=str(e))
+            return 0
+    return 0
+
+class PersistenceQueue:
+    """Write-behind queue for SavedAnalysis rows.
+
+    Request handlers enqueue and return immediately; a background thread in
+    each worker process drains the queue and commits rows in batches. When
+    the queue is full, put() waits briefly for room (backpressure) and then
+    drops the record, counting it.
+    """
+
+    def __init__(self, maxsize=1000, batch_size=50, linger=0.2, put_timeout=0.05):
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.linger = linger
+        self.put_timeout = put_timeout
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._thread = None
+
+    def _ensure_worker(self):
+        # Started lazily so each gunicorn worker gets its own thread after fork
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._queue = queue.Queue(maxsize=self.maxsize)
+            self._thread = threading.Thread(target=self._run, name='analysis-writer', daemon=True)
+            self._thread.start()
+
+    def put(self, record):
+        self._ensure_worker()
+        try:
+            self._queue.put(record, timeout=self.put_timeout)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            log('Analysis write queue full, dropping record', level='warning')
+            return False
+        with self._lock:
+            self.enqueued += 1
+        return True
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            self._write(batch)
+
+    def _write(self, batch):
+        with app.app_context():
+            written = write_analyses(batch)
+        with self._lock:
+            self.batches += 1
+            self.written += written
+            self.failed += len(batch) - written
+        for _ in batch:
+            self._queue.task_done()
+
+    def flush(self, timeout=10):
+        """Wait until everything enqueued so far is written (used on shutdown)"""
+        if self._pid != os.getpid() or self._queue is None:
+            return True
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                log('Analysis write queue flush timed out', level='warning', pending=self._queue.unfinished_tasks)
+                return False
+            time.sleep(0.05)
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enqueued': self.enqueued,
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'batches': self.batches,
+                'pending': self._queue.qsize() if self._queue and self._pid == os.getpid() else 0
+            }
+
+WRITE_BEHIND = os.getenv("WRITE_BEHIND", "1") != "0"
+persistence_queue = PersistenceQueue(
+    maxsize=int(os.getenv("WRITE_QUEUE_SIZE", "1000")),
+    batch_size=int(os.getenv("WRITE_BATCH_SIZE", "50"))
+)
+atexit.register(persistence_queue.flush)
+
+def save_analysis(user_id, analysis_type, data, result):
+    """Persist an analysis to the user's history (write-behind unless WRITE_BEHIND=0)"""
+    record = {
+        'user_id': user_id,
+        'analysis_type': analysis_type,
+        'data': data,
+        'result': result,
+        'created_at': datetime.utcnow()
+    }
+    if WRITE_BEHIND:
+        persistence_queue.put(record)
+    else:
+        write_analyses([record])
+
+def respond_with_analysis(analysis_type, data, system_prompt, user_prompt, provisional=None):
+    """Run an LLM analysis and return it as JSON, or as SSE when requested.
+
+    A provisional result computed locally is sent as the first SSE field so
+    the UI can render before the model answers.
+    """
+    user_id = current_user.id
+
+    if not wants_stream():
+        result = get_groq_json(system_prompt, user_prompt)
+        if result is None and groq_gate.tripped:
+            raise AdmissionRejected("AI service is rate limited", groq_gate.resume_at - time.time())
+        if result:
+            save_analysis(user_id, analysis_type, data, result)
+        return jsonify(result), 200
+
+    def generate():
+        if provisional:
+            yield sse_event('field', {'key': 'provisional', 'value': provisional})
+        try:
+            for event, payload in stream_groq_json(system_prompt, user_prompt):
+                if event == 'field':
+                    key, value = payload
+                    yield sse_event('field', {'key': key, 'value': value})
+                elif payload:
+                    save_analysis(user_id, analysis_type, data, payload)
+                    yield sse_event('done', payload)
+                else:
+                    yield sse_event('error', {'error': 'Analysis failed'})
+        except AdmissionRejected as e:
+            # Headers are already sent, so the 429 travels as an SSE error
+            message = str(e) if e.retry_after is None else f"{e} - please try again in {e.retry_after}s"
+            yield sse_event('error', {'error': message, 'retryAfter': e.retry_after})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 # Custom decorator for API endpoints that require login
 def api_login_required(f):
     @wraps(f)
@@ -123,6 +1394,488 @@ def api_login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+# ============================================
+# RATE LIMITING AND ADMISSION CONTROL
+# ============================================
+
+class AdmissionRejected(Exception):
+    """Request refused by a rate limit or upstream concurrency cap.
+
+    retry_after is None when the request could never be admitted as sent.
+    """
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = None if retry_after is None else max(1, int(math.ceil(retry_after)))
+
+class SharedLimiter:
+    """Token buckets and upstream concurrency slots kept in a SQLite file.
+
+    Every gunicorn worker opens the same file, so limits hold across the
+    whole deployment on one host. Slots are leases: a worker that dies
+    while holding one only blocks it until the lease expires.
+
+    Connections use timeout=0 and lock waits are retried with time.sleep:
+    SQLite's own busy wait blocks in C, which would stall every greenlet
+    of a gevent worker, while time.sleep yields to them.
+    """
+
+    def __init__(self, path, lease=120, poll_interval=0.1, busy_timeout=5, busy_poll=0.005):
+        self.path = path
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.busy_timeout = busy_timeout
+        self.busy_poll = busy_poll
+        self._tables_ready = False
+
+    def _connect(self):
+        # The file and tables are created on first use, not at import
+        if not self._tables_ready:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=0, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if not self._tables_ready:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS token_bucket ("
+                    "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS upstream_slot ("
+                    "id TEXT PRIMARY KEY, upstream TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+                self._tables_ready = True
+        except sqlite3.OperationalError:
+            conn.close()
+            raise
+        return conn
+
+    def _execute(self, operation):
+        """Run operation(conn) on a fresh connection, retrying while another worker holds the lock"""
+        deadline = time.monotonic() + self.busy_timeout
+        while True:
+            try:
+                with closing(self._connect()) as conn:
+                    return operation(conn)
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e) and 'busy' not in str(e) or time.monotonic() >= deadline:
+                    raise
+            time.sleep(self.busy_poll)
+
+    def take_waiting(self, key, rate, burst, cost=1, max_wait=0):
+        """take() that sleeps for the bucket to refill, up to max_wait seconds"""
+        deadline = time.monotonic() + max_wait
+        while True:
+            allowed, retry_after = self.take(key, rate, burst, cost)
+            if allowed:
+                return
+            if time.monotonic() + retry_after > deadline:
+                raise AdmissionRejected("Rate limit exceeded", retry_after)
+            time.sleep(retry_after)
+
+    def take(self, key, rate, burst, cost=1):
+        """Spend cost tokens from a bucket refilled at rate/sec; returns (allowed, retry_after)"""
+        def operation(conn):
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT tokens, updated_at FROM token_bucket WHERE key = ?", (key,)).fetchone()
+            tokens = burst if row is None else min(burst, row[0] + (now - row[1]) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            conn.execute(
+                "INSERT OR REPLACE INTO token_bucket (key, tokens, updated_at) VALUES (?, ?, ?)",
+                (key, tokens, now)
+            )
+            conn.execute("COMMIT")
+            return allowed, 0 if allowed else (cost - tokens) / rate
+        return self._execute(operation)
+
+    def _try_acquire(self, upstream, limit):
+        def operation(conn):
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM upstream_slot WHERE expires_at < ?", (now,))
+            in_use = conn.execute(
+                "SELECT COUNT(*) FROM upstream_slot WHERE upstream = ?", (upstream,)
+            ).fetchone()[0]
+            slot_id = None
+            if in_use < limit:
+                slot_id = uuid.uuid4().hex
+                conn.execute(
+                    "INSERT INTO upstream_slot (id, upstream, expires_at) VALUES (?, ?, ?)",
+                    (slot_id, upstream, now + self.lease)
+                )
+            conn.execute("COMMIT")
+            return slot_id
+        return self._execute(operation)
+
+    @contextmanager
+    def slot(self, upstream, limit, max_wait):
+        """Hold one of limit concurrent slots for upstream, waiting up to max_wait seconds"""
+        deadline = time.monotonic() + max_wait
+        slot_id = self._try_acquire(upstream, limit)
+        while slot_id is None:
+            if time.monotonic() >= deadline:
+                raise AdmissionRejected(f"{upstream} is at capacity", retry_after=max(1, max_wait))
+            time.sleep(self.poll_interval)
+            slot_id = self._try_acquire(upstream, limit)
+        try:
+            yield
+        finally:
+            self._execute(lambda conn: conn.execute("DELETE FROM upstream_slot WHERE id = ?", (slot_id,)))
+
+# Requests per minute and burst size per user, per upstream
+USER_RATE_LIMITS = {
+    'groq': (int(os.getenv("GROQ_USER_RATE_PER_MIN", "20")), int(os.getenv("GROQ_USER_BURST", "10"))),
+    'jsearch': (int(os.getenv("JSEARCH_USER_RATE_PER_MIN", "10")), int(os.getenv("JSEARCH_USER_BURST", "5"))),
+}
+# Concurrent in-flight calls allowed across all workers, per upstream
+UPSTREAM_CONCURRENCY = {
+    'groq': int(os.getenv("GROQ_MAX_CONCURRENCY", "8")),
+    'jsearch': int(os.getenv("JSEARCH_MAX_CONCURRENCY", "4")),
+}
+ADMISSION_MAX_WAIT = float(os.getenv("ADMISSION_MAX_WAIT", "10"))
+
+limiter = SharedLimiter(os.getenv("RATE_LIMIT_DB") or os.path.join(app.instance_path, "ratelimit.db"))
+
+def upstream_slot(upstream):
+    return limiter.slot(upstream, UPSTREAM_CONCURRENCY[upstream], ADMISSION_MAX_WAIT)
+
+def charge_user(user_id, upstream, cost=1, max_wait=0):
+    """Spend cost tokens from a user's bucket for upstream, waiting up to max_wait for a refill"""
+    per_minute, burst = USER_RATE_LIMITS[upstream]
+    if cost > burst:
+        raise AdmissionRejected(f"Request needs {cost} {upstream} calls but at most {burst} are allowed at once", None)
+    limiter.take_waiting(f"user:{user_id}:{upstream}", per_minute / 60.0, burst, cost, max_wait)
+
+def rate_limited(upstream, cost=None):
+    """Charge the current user's token bucket for upstream before running the view.
+
+    cost is a callable returning how many tokens the request spends (default 1).
+    The wrapper exposes charge() and the uncharged view so job_capable can
+    bill only requests that start a new job.
+    """
+    def charge():
+        spend = cost() if cost else 1
+        if spend > 0:
+            charge_user(current_user.id, upstream, spend)
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            charge()
+            return f(*args, **kwargs)
+        decorated_function.charge = charge
+        decorated_function.uncharged = f
+        return decorated_function
+    return decorator
+
+@app.errorhandler(AdmissionRejected)
+def handle_admission_rejected(error):
+    if error.retry_after is None:
+        response = jsonify({'error': 'Too many requests', 'message': str(error), 'retryAfter': None})
+        response.status_code = 429
+        return response
+    response = jsonify({
+        'error': 'Too many requests',
+        'message': f"{error} - please try again in {error.retry_after}s",
+        'retryAfter': error.retry_after
+    })
+    response.status_code = 429
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+# ============================================
+# BACKGROUND JOBS
+# ============================================
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# How long a request carrying only an Idempotency-Key waits for its job inline
+JOB_SYNC_WAIT = float(os.getenv("JOB_SYNC_WAIT", "25"))
+# Jobs still queued/running after this are reported failed (their worker died)
+JOB_TIMEOUT = int(os.getenv("JOB_TIMEOUT", "300"))
+JOB_RETENTION = int(os.getenv("JOB_RETENTION", "86400"))
+JOB_FINAL_STATES = ('done', 'failed')
+
+class JobRunner:
+    """Thread pool that runs queued AnalysisJob rows in the worker that accepted them.
+
+    Job state lives in the database, so any worker can answer polls. Like
+    the write-behind queue, the pool is created lazily per process so each
+    gunicorn worker gets its own threads after fork.
+    """
+
+    def __init__(self, max_workers=4, prune_interval=600):
+        self.max_workers = max_workers
+        self.prune_interval = prune_interval
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._pid = None
+        self._pool = None
+        self._last_prune = 0.0
+
+    def _ensure_pool(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._futures = {}
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='analysis-job')
+            return self._pool
+
+    def submit(self, job_id, view, identity, method, path, body):
+        future = self._ensure_pool().submit(self._run, job_id, view, identity, method, path, body)
+        with self._lock:
+            self.submitted += 1
+            self._futures[job_id] = future
+        future.add_done_callback(lambda _: self._forget(job_id))
+
+    def _forget(self, job_id):
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+    def _run(self, job_id, view, identity, method, path, body):
+        with app.test_request_context(path, method=method, json=body):
+            g.request_id = job_id
+            login_user(SessionUser(**identity))
+            AnalysisJob.query.filter_by(id=job_id).update({'status': 'running', 'started_at': datetime.utcnow()})
+            db.session.commit()
+            try:
+                try:
+                    response = app.make_response(view(**(request.view_args or {})))
+                except Exception as e:
+                    response = app.make_response(app.handle_user_exception(e))
+                status = 'failed' if is_transient_status(response.status_code) else 'done'
+                retry_after = response.headers.get('Retry-After')
+                update = {
+                    'status_code': response.status_code,
+                    'response': response.get_data(as_text=True),
+                    'retry_after': int(retry_after) if retry_after and retry_after.isdigit() else None
+                }
+            except Exception as e:
+                log('Background job failed', level='error', jobId=job_id, error=str(e))
+                status, update = 'failed', {'status_code': 500, 'response': json.dumps({'error': 'Analysis failed'})}
+            db.session.rollback()
+            AnalysisJob.query.filter_by(id=job_id).update(dict(update, status=status, finished_at=datetime.utcnow()))
+            db.session.commit()
+        with self._lock:
+            if status == 'done':
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    def wait(self, job_id, timeout):
+        """Block until the job finishes or timeout passes; jobs from other workers are polled"""
+        with self._lock:
+            future = self._futures.get(job_id) if self._pid == os.getpid() else None
+        if future is not None:
+            try:
+                future.result(timeout=timeout)
+            except Exception:
+                pass
+            return
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            status = db.session.query(AnalysisJob.status).filter_by(id=job_id).scalar()
+            db.session.rollback()
+            if status in JOB_FINAL_STATES:
+                return
+            time.sleep(0.25)
+
+    def prune(self):
+        """Drop jobs older than JOB_RETENTION, at most once per prune_interval per worker"""
+        now = time.time()
+        with self._lock:
+            if now - self._last_prune < self.prune_interval:
+                return
+            self._last_prune = now
+        cutoff = datetime.utcfromtimestamp(now - JOB_RETENTION)
+        AnalysisJob.query.filter(AnalysisJob.created_at < cutoff).delete(synchronize_session=False)
+        db.session.commit()
+
+    def shutdown(self):
+        if self._pool is not None and self._pid == os.getpid():
+            self._pool.shutdown(wait=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'inFlight': len(self._futures) if self._pid == os.getpid() else 0
+            }
+
+job_runner = JobRunner(max_workers=JOB_WORKERS)
+
+def wants_async():
+    return request.args.get('async') == '1' or 'respond-async' in request.headers.get('Prefer', '')
+
+def is_transient_status(status_code):
+    """Rate limits and server errors: worth running again rather than replaying"""
+    return status_code == 429 or status_code >= 500
+
+def job_payload(job):
+    payload = {
+        'jobId': job.id,
+        'status': job.status,
+        'endpoint': job.endpoint,
+        'statusUrl': url_for('job_status', job_id=job.id),
+        'createdAt': job.created_at.isoformat() if job.created_at else None,
+        'finishedAt': job.finished_at.isoformat() if job.finished_at else None
+    }
+    if job.status in JOB_FINAL_STATES:
+        payload['statusCode'] = job.status_code
+        payload['result'] = json.loads(job.response) if job.response else None
+        if job.retry_after:
+            payload['retryAfter'] = job.retry_after
+    return payload
+
+def job_response(job, body, status_code):
+    response = app.response_class(body, status=status_code, mimetype='application/json')
+    if job.retry_after:
+        response.headers['Retry-After'] = str(job.retry_after)
+    return response
+
+def expire_stale_job(job):
+    started = job.started_at or job.created_at
+    if job.status not in JOB_FINAL_STATES and started < datetime.utcnow() - timedelta(seconds=JOB_TIMEOUT):
+        job.status, job.status_code, job.finished_at = 'failed', 504, datetime.utcnow()
+        job.response = json.dumps({'error': 'Analysis did not finish - please try again'})
+        db.session.commit()
+    return job
+
+def job_capable(f):
+    """Run the view as a background AnalysisJob when the client asks for it.
+
+    ?async=1 or 'Prefer: respond-async' returns 202 with a job ID at once.
+    An Idempotency-Key header makes retries attach to the first job instead
+    of calling upstreams again; without async the request waits up to
+    JOB_SYNC_WAIT seconds and answers inline when the job finishes in time.
+    Other requests run the view directly.
+
+    Apply it above @rate_limited: the rate limit is charged only when a new
+    job is created, so retries that attach to an existing job are free.
+    Transient outcomes (429, 5xx) are not kept under the key: the next retry
+    replaces the finished job with a fresh run.
+    """
+    charge = getattr(f, 'charge', None)
+    view = getattr(f, 'uncharged', f)
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if not key and not wants_async():
+            return f(*args, **kwargs)
+
+        body = request.get_json(silent=True) or {}
+        request_hash = hashlib.sha256(
+            json.dumps([request.path, body], sort_keys=True).encode('utf-8')
+        ).hexdigest()
+        job = AnalysisJob.query.filter_by(user_id=current_user.id, idempotency_key=key).first() if key else None
+        if job is not None and job.request_hash == request_hash:
+            job = expire_stale_job(job)
+            if job.status in JOB_FINAL_STATES and is_transient_status(job.status_code):
+                # Only one concurrent retry removes it; the others meet its replacement below
+                AnalysisJob.query.filter_by(id=job.id).delete(synchronize_session=False)
+                db.session.commit()
+                db.session.expunge(job)
+                job = None
+        if job is None:
+            if charge:
+                charge()
+            job = AnalysisJob(id=uuid.uuid4().hex, user_id=current_user.id, endpoint=request.endpoint,
+                              idempotency_key=key, request_hash=request_hash)
+            db.session.add(job)
+            try:
+                db.session.commit()
+                job_runner.submit(job.id, view, user_identity(current_user), request.method, request.path, body)
+            except IntegrityError:
+                # A concurrent retry with the same key created the job first
+                db.session.rollback()
+                job = AnalysisJob.query.filter_by(user_id=current_user.id, idempotency_key=key).one()
+            job_runner.prune()
+        if job.request_hash != request_hash:
+            return jsonify({'error': 'Idempotency-Key was already used for a different request'}), 422
+
+        if not wants_async() and job.status not in JOB_FINAL_STATES:
+            job_runner.wait(job.id, JOB_SYNC_WAIT)
+            db.session.refresh(job)
+        job = expire_stale_job(job)
+        if job.status in JOB_FINAL_STATES and not wants_async():
+            response = job_response(job, job.response, job.status_code)
+            response.headers['X-Job-ID'] = job.id
+            return response
+        response = jsonify(job_payload(job))
+        response.status_code = 202
+        response.headers['Location'] = url_for('job_status', job_id=job.id)
+        return response
+    return decorated_function
+
+@app.route('/api/jobs/<job_id>')
+@api_login_required
+def job_status(job_id):
+    """Status and, once finished, the result of a background job - LOGIN REQUIRED
+
+    ?wait=N long-polls up to N seconds (capped at JOB_SYNC_WAIT) for the job to finish.
+    """
+    job = AnalysisJob.query.filter_by(id=job_id, user_id=current_user.id).first()
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    wait = min(request.args.get('wait', 0, type=float), JOB_SYNC_WAIT)
+    if wait > 0 and job.status not in JOB_FINAL_STATES:
+        job_runner.wait(job.id, wait)
+        db.session.refresh(job)
+    return jsonify(job_payload(expire_stale_job(job))), 200
+
+# ============================================
+# STATIC ASSETS
+# ============================================
+
+ASSET_DIR = os.path.join(app.static_folder, 'dist')
+ASSET_PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+def load_asset_manifest():
+    """Source name -> fingerprinted bundle, written by build_assets.py (empty before a build)"""
+    try:
+        with open(os.path.join(ASSET_DIR, 'manifest.json')) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+asset_manifest = load_asset_manifest()
+
+@app.context_processor
+def asset_helpers():
+    def asset_url(name):
+        if name in asset_manifest:
+            return url_for('built_asset', filename=asset_manifest[name])
+        return url_for('static', filename=name)
+    return {'asset_url': asset_url, 'asset_manifest': asset_manifest}
+
+@app.route('/static/dist/<path:filename>')
+def built_asset(filename):
+    """Fingerprinted bundle, precompressed variant when the client accepts it, cached forever"""
+    mimetype = mimetypes.guess_type(filename)[0]
+    response = None
+    for encoding, suffix in ASSET_PRECOMPRESSED:
+        if request.accept_encodings[encoding] and os.path.isfile(os.path.join(ASSET_DIR, filename + suffix)):
+            response = send_from_directory(ASSET_DIR, filename + suffix, mimetype=mimetype, conditional=False)
+            response.headers['Content-Encoding'] = encoding
+            break
+    if response is None:
+        response = send_from_directory(ASSET_DIR, filename, mimetype=mimetype)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.no_cache = None
+    response.cache_control.max_age = 31536000
+    response.cache_control.immutable = True
+    return response
+
 # ============================================
 # AUTHENTICATION ROUTES
 # ============================================
@@ -168,10 +1921,10 @@ def authorize_google():
             user.avatar = user_info.get('picture')
         
         db.session.commit()
-        login_user(user)
+        sign_in(user)
         return redirect('/')
     except Exception as e:
-        print(f"Google auth error: {e}")
+        log('Google auth failed', level='error', error=str(e))
         return redirect('/?error=auth_failed')
 
 @app.route('/authorize/github')
@@ -206,10 +1959,10 @@ def authorize_github():
             user.avatar = user_info.get('avatar_url')
         
         db.session.commit()
-        login_user(user)
+        sign_in(user)
         return redirect('/')
     except Exception as e:
-        print(f"GitHub auth error: {e}")
+        log('GitHub auth failed', level='error', error=str(e))
         return redirect('/?error=auth_failed')
 
 @app.route('/authorize/linkedin')
@@ -219,11 +1972,12 @@ def authorize_linkedin():
         token = linkedin.authorize_access_token()
         
         headers = {'Authorization': f'Bearer {token["access_token"]}'}
-        profile_resp = requests.get('https://api.linkedin.com/v2/me', headers=headers)
+        profile_resp = http_client.get('https://api.linkedin.com/v2/me', 'linkedin', headers=headers)
         profile = profile_resp.json()
         
-        email_resp = requests.get(
+        email_resp = http_client.get(
             'https://api.linkedin.com/v2/emailAddress?q=members&projection=(elements*(handle~))',
+            'linkedin',
             headers=headers
         )
         email_data = email_resp.json()
@@ -246,16 +2000,17 @@ def authorize_linkedin():
             user.last_login = datetime.utcnow()
         
         db.session.commit()
-        login_user(user)
+        sign_in(user)
         return redirect('/')
     except Exception as e:
-        print(f"LinkedIn auth error: {e}")
+        log('LinkedIn auth failed', level='error', error=str(e))
         return redirect('/?error=auth_failed')
 
 @app.route('/logout')
 @login_required
 def logout():
     logout_user()
+    session.pop('identity_version', None)
     return redirect('/')
 
 @app.route('/api/user')
@@ -274,15 +2029,175 @@ def get_user():
         })
     return jsonify({'authenticated': False})
 
+# ============================================
+# RESUME UPLOADS
+# ============================================
+
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(5 * 1024 * 1024)))
+# Uncompressed size allowed for a DOCX's document.xml, so a zip bomb can't exhaust memory
+DOCX_MAX_XML_BYTES = int(os.getenv("DOCX_MAX_XML_BYTES", str(20 * 1024 * 1024)))
+RESUME_FILE_TYPES = ('pdf', 'docx')
+# Werkzeug rejects larger bodies before they are read; the slack covers multipart framing
+app.config['MAX_CONTENT_LENGTH'] = RESUME_MAX_BYTES + 64 * 1024
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# Parsed text, compacted prompt text and skills per (user, resume_id)
+resume_cache = ResultCache('resume', max_entries=256, ttl=3600)
+
+class ResumeNotFound(Exception):
+    """resume_id is unknown or was uploaded by another user"""
+
+@app.errorhandler(RequestEntityTooLarge)
+def handle_request_too_large(error):
+    return jsonify({"error": f"Requests are limited to {RESUME_MAX_BYTES // (1024 * 1024)} MB"}), 413
+
+@app.errorhandler(ResumeNotFound)
+def handle_resume_not_found(error):
+    return jsonify({'error': 'Resume not found - please upload it again'}), 404
+
+def extract_pdf_text(raw):
+    reader = PdfReader(io.BytesIO(raw))
+    return "\n\n".join(page.extract_text() or '' for page in reader.pages)
+
+def extract_docx_text(raw):
+    with zipfile.ZipFile(io.BytesIO(raw)) as archive:
+        info = archive.getinfo('word/document.xml')
+        if info.file_size > DOCX_MAX_XML_BYTES:
+            raise ValueError("document.xml is too large")
+        # file_size comes from the archive itself, so cap what is actually inflated too
+        with archive.open(info) as member:
+            xml = member.read(DOCX_MAX_XML_BYTES + 1)
+        if len(xml) > DOCX_MAX_XML_BYTES:
+            raise ValueError("document.xml is too large")
+        root = ElementTree.fromstring(xml)
+    paragraphs = []
+    for paragraph in root.iter(f'{WORD_NS}p'):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f'{WORD_NS}t':
+                parts.append(node.text or '')
+            elif node.tag == f'{WORD_NS}tab':
+                parts.append('\t')
+            elif node.tag in (f'{WORD_NS}br', f'{WORD_NS}cr'):
+                parts.append('\n')
+        paragraphs.append(''.join(parts))
+    return "\n".join(paragraphs)
+
+def normalize_resume_text(text):
+    """NFKC (ligatures, non-breaking spaces), collapsed whitespace, at most one blank line in a row"""
+    lines = [" ".join(line.split()) for line in unicodedata.normalize('NFKC', text).splitlines()]
+    normalized = re.sub(r'\n{3,}', '\n\n', "\n".join(lines))
+    return normalized.strip()
+
+def parse_resume_file(filename, raw):
+    """Normalized text of an uploaded PDF/DOCX; ValueError if it can't be read"""
+    file_type = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if file_type not in RESUME_FILE_TYPES:
+        raise ValueError("Only PDF and DOCX resumes are supported")
+    try:
+        text = extract_pdf_text(raw) if file_type == 'pdf' else extract_docx_text(raw)
+    except Exception as e:
+        raise ValueError(f"Could not read {file_type.upper()} file") from e
+    return file_type, normalize_resume_text(text)
+
+def load_resume(resume_id, user_id):
+    """Cached text/promptText/skills/terms for one of the user's uploaded resumes"""
+    cache_key = resume_cache.make_key(user_id, resume_id)
+    cached = resume_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    parsed = (
+        ParsedResume.query.join(user_resume)
+        .filter(ParsedResume.hash == resume_id, user_resume.c.user_id == user_id)
+        .first()
+    )
+    if parsed is None:
+        raise ResumeNotFound(resume_id)
+    text = zlib.decompress(parsed.text_blob.data).decode('utf-8')
+    resume = {
+        'text': text,
+        'promptText': prepare_prompt_text(text, RESUME_TOKEN_BUDGET),
+        'skills': json.loads(parsed.skills or '[]'),
+        # Skill profile for matching; kept in memory only, like the rest of resume_cache
+        'terms': skill_matcher.profile(text)
+    }
+    resume_cache.set(cache_key, resume)
+    return resume
+
+def resume_input(data):
+    """(data with 'resume' filled in, compacted resume prompt text, skill profile or None)
+    from raw text or a resume_id; uploaded resumes reuse their cached profile"""
+    resume_id = data.get('resume_id')
+    if not resume_id:
+        return data, prepare_prompt_text(data.get('resume'), RESUME_TOKEN_BUDGET), None
+    resume = load_resume(resume_id, current_user.id)
+    return dict(data, resume=resume['text']), resume['promptText'], resume['terms']
+
+@app.route('/api/resumes', methods=['POST'])
+@api_login_required
+def upload_resume():
+    """Parse an uploaded PDF/DOCX resume once and return a reusable resume_id - LOGIN REQUIRED
+
+    Multipart field 'file'. Identical files are parsed only once; analysis
+    endpoints accept the returned resumeId as 'resume_id' instead of text.
+    """
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        return jsonify({"error": "Please choose a PDF or DOCX file"}), 400
+    raw = upload.read(RESUME_MAX_BYTES + 1)
+    if len(raw) > RESUME_MAX_BYTES:
+        return jsonify({"error": f"Resume files are limited to {RESUME_MAX_BYTES // (1024 * 1024)} MB"}), 413
+
+    digest = hashlib.sha256(raw).hexdigest()
+    user = db.session.get(User, current_user.id)
+    parsed = db.session.get(ParsedResume, digest)
+    if parsed is None:
+        try:
+            file_type, text = parse_resume_file(upload.filename, raw)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if not text:
+            return jsonify({"error": "No text found in this file - is it a scanned image?"}), 422
+        parsed = ParsedResume(
+            hash=digest,
+            text_blob=get_or_create_blob(text),
+            skills=json.dumps(extract_skills(skill_matcher.profile(text))),
+            filename=upload.filename[:255],
+            file_type=file_type
+        )
+        db.session.add(parsed)
+    if user not in parsed.users:
+        parsed.users.append(user)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent upload of the same file won the insert
+        db.session.rollback()
+        user = db.session.get(User, current_user.id)
+        parsed = db.session.get(ParsedResume, digest)
+        if user not in parsed.users:
+            parsed.users.append(user)
+            db.session.commit()
+
+    resume = load_resume(digest, current_user.id)
+    return jsonify({
+        'resumeId': digest,
+        'filename': parsed.filename,
+        'text': resume['text'],
+        'skills': resume['skills']
+    }), 201
+
 # ============================================
 # PROTECTED API ROUTES (LOGIN REQUIRED)
 # ============================================
 
 @app.route('/api/analyze-resume', methods=['POST'])
 @api_login_required
+@job_capable
+@rate_limited('groq')
 def analyze_resume():
     """Resume analysis - LOGIN REQUIRED"""
-    data = request.get_json()
+    data, resume, _ = resume_input(request.get_json())
     system = """
     Return a JSON object with:
     - 'rating': int (1-10)
@@ -291,30 +2206,10 @@ def analyze_resume():
     - 'skills': array of strings
     - 'suggestions': array of objects, each with 'title', 'description', and 'type' (use 'success', 'warning', or 'info')
     """
-    user = f"Resume Content: {data.get('resume')}"
-    result = get_groq_json(system, user)
-    
-    # Save to user's history
-    if result:
-        try:
-            analysis = SavedAnalysis(
-                user_id=current_user.id,
-                analysis_type='resume',
-                data=json.dumps({'input': data, 'output': result})
-            )
-            db.session.add(analysis)
-            db.session.commit()
-        except Exception as e:
-            print(f"Error saving analysis: {e}")
-    
-    return jsonify(result), 200
+    user = f"Resume Content: {resume}"
+    return respond_with_analysis('resume', data, system, user)
 
-@app.route('/api/analyze-match', methods=['POST'])
-@api_login_required
-def analyze_match():
-    """Match analysis - LOGIN REQUIRED"""
-    data = request.get_json()
-    system = """
+MATCH_SYSTEM_PROMPT = """
     Compare Resume vs Job Description. Return JSON:
     - 'score': int (0-100) - overall match score
     - 'verdict': string - brief verdict message
@@ -327,59 +2222,143 @@ def analyze_match():
         - 'keywords': percentage of important keywords matched
     - 'suggestions': array of objects with 'title', 'description', and 'type' (use 'success', 'warning', or 'info')
     """
-    user = f"Resume: {data.get('resume')}\nJD: {data.get('jd')}"
-    result = get_groq_json(system, user)
-    
-    # Save to user's history
-    if result:
-        try:
-            analysis = SavedAnalysis(
-                user_id=current_user.id,
-                analysis_type='match',
-                data=json.dumps({'input': data, 'output': result})
-            )
-            db.session.add(analysis)
-            db.session.commit()
-        except Exception as e:
-            print(f"Error saving analysis: {e}")
-    
-    return jsonify(result), 200
+
+@app.route('/api/analyze-match', methods=['POST'])
+@api_login_required
+@job_capable
+@rate_limited('groq')
+def analyze_match():
+    """Match analysis - LOGIN REQUIRED"""
+    data, resume, resume_terms = resume_input(request.get_json())
+    jd = prepare_prompt_text(data.get('jd'), JD_TOKEN_BUDGET)
+    provisional = local_match(resume, jd, resume_terms=resume_terms)
+    user = f"Resume: {resume}\nJD: {jd}\n{skill_summary(provisional)}"
+    return respond_with_analysis('match', data, MATCH_SYSTEM_PROMPT, user, provisional=provisional)
+
+BATCH_MATCH_MAX_JDS = int(os.getenv("BATCH_MATCH_MAX_JDS", "50"))
+BATCH_MATCH_CONCURRENCY = int(os.getenv("BATCH_MATCH_CONCURRENCY", "5"))
+# Pairs whose local pre-filter score is below this skip the LLM
+BATCH_MATCH_MIN_SCORE = int(os.getenv("BATCH_MATCH_MIN_SCORE", "25"))
+# How long a batch may wait for the user's Groq bucket to refill; the default
+# covers a full BATCH_MATCH_MAX_JDS batch at the default rate and burst
+BATCH_MATCH_MAX_WAIT = float(os.getenv("BATCH_MATCH_MAX_WAIT", "150"))
+
+def match_one(resume, jd, provisional, user_id, deadline):
+    """One resume-vs-JD comparison, retried once if Groq rate-limited it.
+
+    Each pair that reaches Groq spends one token from the user's bucket,
+    waiting for a refill until deadline; skipped pairs are free.
+    """
+    if provisional['score'] < BATCH_MATCH_MIN_SCORE:
+        return dict(provisional, verdict='Low match - skipped detailed analysis', skipped=True)
+    user = f"Resume: {resume}\nJD: {prepare_prompt_text(jd, JD_TOKEN_BUDGET)}\n{skill_summary(provisional)}"
+    try:
+        charge_user(user_id, 'groq', max_wait=max(0, deadline - time.monotonic()))
+        result = get_groq_json(MATCH_SYSTEM_PROMPT, user, label='analyze_match_batch')
+        if result is None and groq_gate.tripped:
+            result = get_groq_json(MATCH_SYSTEM_PROMPT, user, label='analyze_match_batch')
+    except AdmissionRejected as e:
+        log('Batch match item rejected', level='warning', error=str(e))
+        return None
+    return result
+
+@app.route('/api/analyze-match/batch', methods=['POST'])
+@api_login_required
+@job_capable
+def analyze_match_batch():
+    """Compare one resume against many JDs concurrently - LOGIN REQUIRED
+
+    Body: {"resume": str, "jds": [str | {"id": any, "jd": str}, ...]}. With
+    ?stream=1 each comparison is sent as an SSE 'result' event as it
+    finishes; otherwise all results are returned together. The batch is
+    saved as one history entry. Rate limits are charged per pair as it is
+    sent to Groq (see match_one), not up front.
+    """
+    data = request.get_json() or {}
+    jds = [jd if isinstance(jd, dict) else {'jd': jd} for jd in data.get('jds') or []]
+    if not (data.get('resume') or data.get('resume_id')) or not jds:
+        return jsonify({"error": "Please provide a resume and at least one job description"}), 400
+    if len(jds) > BATCH_MATCH_MAX_JDS:
+        return jsonify({"error": f"At most {BATCH_MATCH_MAX_JDS} job descriptions per batch"}), 400
+
+    user_id = current_user.id
+
+    data, prompt_resume, resume_terms = resume_input(data)
+    resume = data['resume']
+    idf = inverse_document_frequencies([prompt_resume] + [jd.get('jd') or '' for jd in jds])
+    resume_terms = resume_terms or skill_matcher.profile(prompt_resume)
+    provisional = [local_match(prompt_resume, jd.get('jd') or '', idf, resume_terms) for jd in jds]
+
+    def run():
+        deadline = time.monotonic() + BATCH_MATCH_MAX_WAIT
+        with ThreadPoolExecutor(max_workers=BATCH_MATCH_CONCURRENCY) as pool:
+            futures = {
+                pool.submit(match_one, prompt_resume, jd.get('jd'), provisional[index], user_id, deadline): index
+                for index, jd in enumerate(jds)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                yield {'index': index, 'id': jds[index].get('id', index), 'result': future.result()}
+
+    def save(results):
+        results = sorted(results, key=lambda r: r['index'])
+        save_analysis(user_id, 'match_batch', {'resume': resume, 'jds': [jd.get('jd') for jd in jds]}, {
+            'results': [dict(r['result'], id=r['id']) for r in results if r['result']]
+        })
+        return results
+
+    if not wants_stream():
+        results = save(list(run()))
+        return jsonify({
+            'results': results,
+            'failed': sum(1 for r in results if not r['result'])
+        }), 200
+
+    def generate():
+        results = []
+        for item in run():
+            results.append(item)
+            yield sse_event('result', item)
+        save(results)
+        yield sse_event('done', {'count': len(results), 'failed': sum(1 for r in results if not r['result'])})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 @app.route('/api/analyze-jd', methods=['POST'])
 @api_login_required
+@job_capable
+@rate_limited('groq')
 def analyze_jd():
     """JD analysis - LOGIN REQUIRED"""
     data = request.get_json()
     system = "Return keys: 'overview', 'mustHaveSkills', 'niceToHaveSkills', 'responsibilities', 'preparationTips'."
-    user = f"JD: {data.get('jd')}"
-    result = get_groq_json(system, user)
-    
-    # Save to user's history
-    if result:
-        try:
-            analysis = SavedAnalysis(
-                user_id=current_user.id,
-                analysis_type='jd',
-                data=json.dumps({'input': data, 'output': result})
-            )
-            db.session.add(analysis)
-            db.session.commit()
-        except Exception as e:
-            print(f"Error saving analysis: {e}")
-    
-    return jsonify(result), 200
+    user = f"JD: {prepare_prompt_text(data.get('jd'), JD_TOKEN_BUDGET)}"
+    return respond_with_analysis('jd', data, system, user)
 
 @app.route('/api/find-linkedin-jobs', methods=['POST'])
 @api_login_required
+@job_capable
+@rate_limited('jsearch', cost=lambda: job_search_cost())
 def find_linkedin_jobs():
     """Job search - LOGIN REQUIRED"""
     try:
         data = request.get_json()
+        if data.get('cursor'):
+            return jobs_page_from_cursor(data['cursor'])
+        resume_id = data.get('resume_id')
+        data, _, resume_terms = resume_input(data)
+
         role = data.get('role', '').strip()
         location = data.get('location', '').strip()
         experience_level = data.get('experienceLevel', '')
         filter_type = data.get('filterType', '')
         resume = data.get('resume', None)
+        if resume and resume_terms is None:
+            resume_terms = skill_matcher.profile(resume)
         
         if not role:
             return jsonify({"error": "Please enter a job role to search for", "jobs": []}), 400
@@ -394,89 +2373,112 @@ def find_linkedin_jobs():
         
         search_query = f"{' '.join(search_parts)} in {location}"
         
-        url = "https://jsearch.p.rapidapi.com/search"
-        querystring = {"query": search_query, "num_pages": "1"}
-        headers = {
-            "x-rapidapi-key": os.getenv("RAPIDAPI_KEY"),
-            "x-rapidapi-host": "jsearch.p.rapidapi.com"
+        state = {
+            'userId': current_user.id,
+            'query': search_query,
+            # Uploaded resumes are re-read through resume_cache instead of copied into the cursor
+            'resumeId': resume_id,
+            'resume': None if resume_id else resume,
+            'experienceLevel': experience_level,
+            'jobs': [],
+            'offset': 0,
+            'nextUpstreamPage': 1,
+            'exhausted': False
         }
-        
-        api_res = requests.get(url, headers=headers, params=querystring)
-        api_res.raise_for_status()
-        results = api_res.json().get('data', [])
-
-        formatted_jobs = []
-        for job in results[:10]:
-            job_title = job.get('job_title', '')
-            job_desc = job.get('job_description', '')
-            detected_level = detect_experience_level(job_title, job_desc)
-            
-            job_type = 'Full-time'
-            if 'contract' in job_title.lower() or 'contract' in job_desc.lower():
-                job_type = 'Contract'
-            elif 'part-time' in job_title.lower() or 'part-time' in job_desc.lower():
-                job_type = 'Part-time'
-            elif 'intern' in job_title.lower():
-                job_type = 'Internship'
-            
-            formatted_jobs.append({
-                "title": job.get('job_title', 'Role'),
-                "company": job.get('employer_name', 'N/A'),
-                "description": job.get('job_description', '')[:200] + "..." if job.get('job_description') else '',
-                "url": job.get('job_apply_link', '#'),
-                "matchScore": calculate_match_score(job, resume, experience_level),
-                "matchLevel": "high",
-                "requiredSkills": job.get('job_required_skills', [])[:4] if job.get('job_required_skills') else [],
-                "postedDate": format_posted_date(job.get('job_posted_at_datetime_utc', '')),
-                "experienceLevel": detected_level,
-                "jobType": job_type
-            })
-
-        summary_parts = [f"Found {len(formatted_jobs)} {role} opportunities"]
+        page = next_jobs_page(state, resume_terms)
+
+        summary_parts = [f"Found {len(state['jobs'])}{'' if state['exhausted'] else '+'} {role} opportunities"]
         if experience_level and experience_level != '':
             summary_parts.append(f"at {experience_level} level")
         summary_parts.append(f"in {location}")
         summary = " ".join(summary_parts)
-        
-        result = {"jobs": formatted_jobs, "summary": summary}
+        result = dict(page, summary=summary)
         
         # Save to user's history
-        try:
-            analysis = SavedAnalysis(
-                user_id=current_user.id,
-                analysis_type='jobs',
-                data=json.dumps({'input': data, 'output': result})
-            )
-            db.session.add(analysis)
-            db.session.commit()
-        except Exception as e:
-            print(f"Error saving analysis: {e}")
+        save_analysis(current_user.id, 'jobs', data, result)
         
         return jsonify(result), 200
 
+    except (AdmissionRejected, ResumeNotFound):
+        raise
     except requests.exceptions.RequestException as e:
-        print(f"API Error: {str(e)}")
+        log('Job search upstream failed', level='error', error=str(e))
         return jsonify({"error": "Failed to fetch jobs from the API.", "jobs": []}), 500
     except Exception as e:
-        print(f"Error: {str(e)}")
+        log('Job search failed', level='error', error=str(e))
         return jsonify({"error": "An unexpected error occurred.", "jobs": []}), 500
 
 # ============================================
 # USER HISTORY (Protected Routes)
 # ============================================
 
+HISTORY_PAGE_SIZE = 20
+HISTORY_MAX_PAGE_SIZE = 50
+
 @app.route('/api/history')
 @login_required
 def get_history():
-    """Get user's saved analyses"""
-    analyses = SavedAnalysis.query.filter_by(user_id=current_user.id).order_by(SavedAnalysis.created_at.desc()).limit(50).all()
+    """Get a page of the user's saved analyses, newest first.
+
+    Pages with keyset pagination: pass the previous response's nextBefore
+    as ?before=<created_at>,<id>. By default only summaries are returned;
+    ?mode=full includes each full payload.
+    """
+    try:
+        limit = max(1, min(int(request.args.get('limit', HISTORY_PAGE_SIZE)), HISTORY_MAX_PAGE_SIZE))
+    except ValueError:
+        return jsonify({'error': 'Invalid limit'}), 400
+    full = request.args.get('mode') == 'full'
+
+    columns = [SavedAnalysis.id, SavedAnalysis.analysis_type, SavedAnalysis.summary, SavedAnalysis.created_at]
+    if full:
+        columns.append(SavedAnalysis.data)
+    query = db.session.query(*columns).filter(SavedAnalysis.user_id == current_user.id)
+
+    before = request.args.get('before')
+    if before:
+        try:
+            before_time, before_id = before.rsplit(',', 1)
+            before_time, before_id = datetime.fromisoformat(before_time), int(before_id)
+        except ValueError:
+            return jsonify({'error': 'Invalid before cursor'}), 400
+        query = query.filter(db.or_(
+            SavedAnalysis.created_at < before_time,
+            db.and_(SavedAnalysis.created_at == before_time, SavedAnalysis.id < before_id)
+        ))
+
+    rows = query.order_by(SavedAnalysis.created_at.desc(), SavedAnalysis.id.desc()).limit(limit).all()
+
+    analyses = []
+    for row in rows:
+        item = {
+            'id': row.id,
+            'type': row.analysis_type,
+            'summary': json.loads(row.summary) if row.summary else {},
+            'created_at': row.created_at.isoformat()
+        }
+        if full:
+            item['data'] = unpack_analysis_data(row.data)
+        analyses.append(item)
+
+    next_before = None
+    if rows and len(rows) == limit:
+        next_before = f"{rows[-1].created_at.isoformat()},{rows[-1].id}"
+
+    return jsonify({'analyses': analyses, 'nextBefore': next_before})
+
+@app.route('/api/history/<int:analysis_id>')
+@login_required
+def get_analysis(analysis_id):
+    """Get one saved analysis with its full payload"""
+    analysis = SavedAnalysis.query.filter_by(id=analysis_id, user_id=current_user.id).first()
+    if not analysis:
+        return jsonify({'error': 'Analysis not found'}), 404
     return jsonify({
-        'analyses': [{
-            'id': a.id,
-            'type': a.analysis_type,
-            'data': json.loads(a.data),
-            'created_at': a.created_at.isoformat()
-        } for a in analyses]
+        'id': analysis.id,
+        'type': analysis.analysis_type,
+        'data': unpack_analysis_data(analysis.data),
+        'created_at': analysis.created_at.isoformat()
     })
 
 @app.route('/api/history/<int:analysis_id>', methods=['DELETE'])
@@ -485,36 +2487,498 @@ def delete_analysis(analysis_id):
     """Delete a saved analysis"""
     analysis = SavedAnalysis.query.filter_by(id=analysis_id, user_id=current_user.id).first()
     if analysis:
+        blob_hashes = [blob.hash for blob in analysis.blobs]
         db.session.delete(analysis)
+        db.session.flush()
+        delete_orphan_blobs(blob_hashes)
         db.session.commit()
         return jsonify({'success': True})
     return jsonify({'error': 'Analysis not found'}), 404
 
+@app.route('/api/cache/stats')
+@login_required
+def cache_stats():
+    """Result cache hit/miss/eviction counters"""
+    return jsonify({'llm': llm_cache.stats(), 'jsearch': jobs_cache.stats()})
+
+@app.route('/api/persistence/stats')
+@login_required
+def persistence_stats():
+    """Write-behind queue counters for this worker"""
+    return jsonify({'writeQueue': persistence_queue.stats(), 'jobs': job_runner.stats()})
+
+@app.route('/api/upstream/stats')
+@login_required
+def upstream_stats():
+    """Per-upstream latency, error and circuit breaker state"""
+    return jsonify({'upstreams': http_client.snapshot(), 'groqTokens': token_usage.snapshot()})
+
+@metrics.collector
+def collect_app_counters():
+    caches = {
+        'llm': llm_cache, 'jsearch': jobs_cache, 'job_pages': job_pages, 'resume': resume_cache,
+        'user': user_cache, 'listing_classification': listing_classifications
+    }
+    cache_stats = {name: cache.stats() for name, cache in caches.items()}
+    tokens = token_usage.snapshot()
+    queue_stats = persistence_queue.stats()
+    return [
+        ('hirevoid_cache_requests_total', 'counter', 'Result cache lookups by outcome',
+         [({'cache': name, 'result': 'hit'}, s['hits']) for name, s in cache_stats.items()]
+         + [({'cache': name, 'result': 'miss'}, s['misses']) for name, s in cache_stats.items()]),
+        ('hirevoid_cache_hit_ratio', 'gauge', 'Result cache hit ratio since worker start',
+         [({'cache': name}, s['hitRatio']) for name, s in cache_stats.items()]),
+        ('hirevoid_cache_entries', 'gauge', 'Entries held in the in-memory cache tier',
+         [({'cache': name}, s['size']) for name, s in cache_stats.items()]),
+        ('hirevoid_groq_tokens_total', 'counter', 'Groq tokens consumed by endpoint',
+         [({'endpoint': label, 'kind': 'prompt'}, t['promptTokens']) for label, t in tokens.items()]
+         + [({'endpoint': label, 'kind': 'completion'}, t['completionTokens']) for label, t in tokens.items()]),
+        ('hirevoid_upstream_circuit_open', 'gauge', '1 while an upstream circuit breaker is open',
+         [({'upstream': name}, int(snap['circuit'] == 'open')) for name, snap in http_client.snapshot().items()]),
+        ('hirevoid_write_queue_depth', 'gauge', 'Analyses waiting in the write-behind queue',
+         [({}, queue_stats['pending'])]),
+        ('hirevoid_jobs_in_flight', 'gauge', 'Background jobs queued or running in this worker',
+         [({}, job_runner.stats()['inFlight'])]),
+    ]
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus text exposition for this worker; set METRICS_TOKEN to require a bearer token"""
+    token = os.getenv("METRICS_TOKEN")
+    if token and request.headers.get('Authorization') != f"Bearer {token}":
+        return jsonify({'error': 'Unauthorized'}), 401
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# ============================================
+# SKILL MATCHING
+# ============================================
+
+# Canonical skill -> alternative spellings seen in resumes and JSearch listings
+# Plain words ("rest", "node", "ts") are left out: they match ordinary prose
+SKILL_SYNONYMS = {
+    'javascript': ['js', 'ecmascript', 'es6'],
+    'kubernetes': ['k8s'],
+    'node.js': ['nodejs'],
+    'react': ['react.js', 'reactjs'],
+    'vue': ['vue.js', 'vuejs'],
+    'angular': ['angular.js', 'angularjs'],
+    'next.js': ['nextjs'],
+    'golang': ['go lang'],
+    'postgresql': ['postgres', 'psql'],
+    'mongodb': ['mongo'],
+    'amazon web services': ['aws'],
+    'google cloud platform': ['gcp', 'google cloud'],
+    'microsoft azure': ['azure'],
+    'machine learning': ['ml'],
+    'artificial intelligence': ['ai'],
+    'natural language processing': ['nlp'],
+    'continuous integration': ['ci', 'ci cd', 'ci/cd'],
+    'c#': ['csharp', 'c sharp'],
+    'c++': ['cpp'],
+    '.net': ['dotnet', 'asp.net'],
+    'python': ['py', 'python3'],
+    'scikit-learn': ['sklearn', 'scikit learn'],
+    'rest api': ['restful', 'restful api', 'rest apis'],
+    'sql': ['structured query language'],
+    'user experience': ['ux'],
+    'user interface': ['ui'],
+}
+
+class SkillProfile(frozenset):
+    """Canonical terms of a document, plus its normalized token text for longer phrases"""
+
+    def __new__(cls, terms, text):
+        profile = super().__new__(cls, terms)
+        profile.text = text
+        return profile
+
+class SkillMatcher:
+    """Token-based skill matcher.
+
+    A resume is tokenized once into a set of canonical terms (word n-grams
+    up to the longest known skill or synonym, with synonyms folded in). Each
+    required skill is normalized the same way, so matching a job is a
+    handful of set lookups and respects word boundaries ("Go" no longer
+    matches "Google"). Skills longer than that are matched as a contiguous
+    run of tokens.
+    """
+
+    TOKEN_RE = re.compile(r"\.?[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+    MIN_NGRAM = 3
+
+    def __init__(self, synonyms):
+        self.canonical = {}
+        for skill, aliases in synonyms.items():
+            target = self.normalize(skill)
+            for alias in [skill] + aliases:
+                self.canonical[self.normalize(alias)] = target
+        self.max_ngram = max([self.MIN_NGRAM] + [len(phrase.split()) for phrase in self.canonical])
+
+    def tokenize(self, text):
+        return self.TOKEN_RE.findall(text.lower())
+
+    def normalize(self, phrase):
+        return " ".join(self.tokenize(phrase))
+
+    def canonicalize(self, phrase):
+        normalized = self.normalize(phrase)
+        return self.canonical.get(normalized, normalized)
+
+    def profile(self, text):
+        """Set of canonical terms present in a document"""
+        tokens = self.tokenize(text)
+        terms = set()
+        for n in range(1, self.max_ngram + 1):
+            for i in range(len(tokens) - n + 1):
+                gram = " ".join(tokens[i:i + n])
+                terms.add(self.canonical.get(gram, gram))
+        return SkillProfile(terms, f" {' '.join(tokens)} ")
+
+    def contains(self, terms, canonical):
+        if canonical in terms:
+            return True
+        # Longer than any stored n-gram: look for the phrase as a token run
+        return canonical.count(" ") >= self.max_ngram and f" {canonical} " in getattr(terms, 'text', '')
+
+    def match(self, skills, terms):
+        """Split skills into (matched, missing) against a profile"""
+        matched, missing = [], []
+        for skill in skills:
+            (matched if self.contains(terms, self._canonical_skill(skill)) else missing).append(skill)
+        return matched, missing
+
+    @functools.lru_cache(maxsize=4096)
+    def _canonical_skill(self, skill):
+        return self.canonicalize(skill)
+
+skill_matcher = SkillMatcher(SKILL_SYNONYMS)
+
+# ============================================
+# LOCAL MATCH SCORING
+# ============================================
+
+# Skills recognised when pre-extracting from free text, besides SKILL_SYNONYMS keys
+EXTRA_SKILLS = [
+    'java', 'kotlin', 'swift', 'rust', 'ruby', 'php', 'scala', 'html', 'css', 'sass',
+    'tailwind css', 'redux', 'django', 'flask', 'fastapi', 'spring', 'express', 'nestjs',
+    'graphql', 'mysql', 'redis', 'elasticsearch', 'kafka', 'spark', 'hadoop', 'airflow',
+    'pandas', 'numpy', 'pytorch', 'tensorflow', 'keras', 'tableau', 'power bi', 'excel',
+    'terraform', 'ansible', 'jenkins', 'github actions', 'linux', 'git', 'jira', 'figma',
+    'microservices', 'agile', 'scrum', 'data analysis', 'statistics', 'computer vision',
+    'docker', 'selenium', 'jest', 'webpack', 'snowflake', 'dbt', 'bigquery', 'r',
+]
+KNOWN_SKILLS = frozenset(
+    skill_matcher.canonicalize(skill) for skill in list(SKILL_SYNONYMS) + EXTRA_SKILLS
+)
+
+STOPWORDS = frozenset("""
+    a an and are as at be by for from has have in is it its of on or our that the their this to
+    we will with you your they them who what which about into than then there these those
+    experience work working team teams role strong ability skills years year plus etc using
+""".split())
+
+def term_vector(text, idf=None):
+    """Sparse TF-IDF vector ({term: weight}) with sublinear term frequency"""
+    counts = {}
+    for token in skill_matcher.tokenize(text):
+        if token not in STOPWORDS and len(token) > 1:
+            counts[token] = counts.get(token, 0) + 1
+    return {
+        term: (1 + math.log(count)) * (idf.get(term, 1.0) if idf else 1.0)
+        for term, count in counts.items()
+    }
+
+def cosine(u, v):
+    if len(u) > len(v):
+        u, v = v, u
+    dot = sum(weight * v.get(term, 0.0) for term, weight in u.items())
+    if not dot:
+        return 0.0
+    return dot / (math.sqrt(sum(w * w for w in u.values())) * math.sqrt(sum(w * w for w in v.values())))
+
+def inverse_document_frequencies(documents):
+    """Smoothed IDF over a small corpus, e.g. one resume plus a batch of JDs"""
+    doc_freq = {}
+    for document in documents:
+        for term in set(term_vector(document)):
+            doc_freq[term] = doc_freq.get(term, 0) + 1
+    total = len(documents)
+    return {term: math.log((1 + total) / (1 + freq)) + 1 for term, freq in doc_freq.items()}
+
+def extract_skills(terms):
+    return sorted(KNOWN_SKILLS & terms)
+
+def local_match(resume, jd, idf=None, resume_terms=None):
+    """Instant provisional match: text similarity plus skill coverage, no LLM.
+
+    Returns the same 'score' / 'matchedSkills' / 'missingSkills' keys as the
+    LLM match so the UI can render it directly.
+    """
+    resume_terms = resume_terms or skill_matcher.profile(resume)
+    jd_skills = extract_skills(skill_matcher.profile(jd))
+    matched = [skill for skill in jd_skills if skill in resume_terms]
+    missing = [skill for skill in jd_skills if skill not in resume_terms]
+
+    similarity = cosine(term_vector(resume, idf), term_vector(jd, idf))
+    coverage = len(matched) / len(jd_skills) if jd_skills else similarity
+    # Resume/JD cosine rarely exceeds ~0.5 even for strong matches
+    score = round(100 * (0.5 * min(1.0, similarity / 0.5) + 0.5 * coverage))
+    return {
+        'score': score,
+        'similarity': round(similarity, 3),
+        'matchedSkills': matched,
+        'missingSkills': missing,
+        'breakdown': {'skills': round(100 * coverage)}
+    }
+
+def skill_summary(provisional):
+    """Compact hint for the LLM prompt built from the local pre-filter"""
+    return (
+        f"Pre-extracted skills - in both: {', '.join(provisional['matchedSkills']) or 'none'}; "
+        f"required but not found in resume: {', '.join(provisional['missingSkills']) or 'none'}."
+    )
+
 # Helper functions
-def detect_experience_level(title, description):
-    text = (title + " " + description).lower()
-    if any(word in text for word in ['intern', 'internship', 'student']):
-        return 'Internship'
-    elif any(word in text for word in ['entry', 'junior', 'graduate', 'associate']):
-        return 'Entry Level'
-    elif any(word in text for word in ['senior', 'sr.', 'sr ']):
-        return 'Senior'
-    elif any(word in text for word in ['lead', 'principal', 'staff']):
-        return 'Lead'
-    elif any(word in text for word in ['manager', 'head of', 'director']):
-        return 'Manager'
-    elif any(word in text for word in ['vp', 'vice president', 'cto', 'ceo']):
-        return 'Executive'
-    elif any(word in text for word in ['mid-level', 'intermediate', '3-5 years', '2-4 years']):
-        return 'Mid Level'
+JOB_PAGE_SIZE = int(os.getenv("JOB_PAGE_SIZE", "10"))
+JOB_SEARCH_CONCURRENCY = int(os.getenv("JOB_SEARCH_CONCURRENCY", "3"))
+JSEARCH_PAGE_SIZE = 10
+
+# Formatted results of recent searches, keyed by next-page cursor
+# Search state behind "Load more" cursors; the SQLite tier lets any worker continue a search
+job_pages = ResultCache(
+    'job_pages',
+    max_entries=512,
+    ttl=int(os.getenv("JOB_CURSOR_TTL", "900")),
+    db_path=os.getenv("JOB_CURSOR_DB") or os.path.join(app.instance_path, "job_cursors.db")
+)
+
+def fetch_formatted_jobs(search_query, first_page, page_count, resume_terms, experience_level):
+    """Fetch page_count JSearch pages (in parallel when several) and format them in order.
+
+    Returns (jobs, next upstream page, exhausted). A failed page after the
+    first ends the fetch there, keeping the pages before it, and leaves the
+    search open so a later "Load more" retries it; only a failed first page
+    raises.
+    """
+    pages = range(first_page, first_page + page_count)
+
+    def fetch(page):
+        try:
+            return search_jsearch(search_query, page), None
+        except Exception as e:
+            return None, e
+
+    if page_count == 1:
+        results = [fetch(first_page)]
     else:
-        return None
+        with ThreadPoolExecutor(max_workers=JOB_SEARCH_CONCURRENCY) as pool:
+            results = list(pool.map(fetch, pages))
+
+    jobs, next_page, exhausted = [], first_page, False
+    for page, (listings, error) in zip(pages, results):
+        if error is not None:
+            if page == first_page:
+                raise error
+            log('JSearch page failed, keeping earlier pages', level='warning', page=page, error=str(error))
+            break
+        jobs.extend(format_job(job, resume_terms, experience_level) for job in listings)
+        next_page = page + 1
+        if len(listings) < JSEARCH_PAGE_SIZE:
+            exhausted = True
+            break
+    return jobs, next_page, exhausted
+
+def needs_upstream_page(state):
+    return state['offset'] + JOB_PAGE_SIZE > len(state['jobs']) and not state['exhausted']
+
+def job_search_cost():
+    """Rate-limit tokens for a job search: cursor pages already fetched are free"""
+    data = request.get_json(silent=True) or {}
+    if not data.get('cursor'):
+        return 1
+    state = job_pages.get(data['cursor'])
+    return 1 if state and needs_upstream_page(state) else 0
+
+def search_resume_terms(state):
+    """Skill profile of the resume a stored search scores against, or None"""
+    if state.get('resumeId'):
+        return load_resume(state['resumeId'], state['userId'])['terms']
+    return skill_matcher.profile(state['resume']) if state.get('resume') else None
+
+def next_jobs_page(state, resume_terms=None):
+    """Slice the next page out of a stored search, fetching only the upstream pages it needs"""
+    offset = state['offset']
+    if needs_upstream_page(state):
+        missing = offset + JOB_PAGE_SIZE - len(state['jobs'])
+        more, state['nextUpstreamPage'], state['exhausted'] = fetch_formatted_jobs(
+            state['query'], state['nextUpstreamPage'], math.ceil(missing / JSEARCH_PAGE_SIZE),
+            resume_terms if resume_terms is not None else search_resume_terms(state), state['experienceLevel']
+        )
+        state['jobs'] = state['jobs'] + more
+
+    jobs = state['jobs'][offset:offset + JOB_PAGE_SIZE]
+    state['offset'] = offset + len(jobs)
+
+    next_cursor = None
+    if jobs and (state['offset'] < len(state['jobs']) or not state['exhausted']):
+        next_cursor = uuid.uuid4().hex
+        job_pages.set(next_cursor, state)
+
+    return {
+        "jobs": jobs,
+        "page": offset // JOB_PAGE_SIZE + 1,
+        "nextCursor": next_cursor
+    }
+
+def jobs_page_from_cursor(cursor):
+    state = job_pages.get(cursor)
+    if not state or state['userId'] != current_user.id:
+        return jsonify({"error": "This search has expired. Please search again.", "jobs": []}), 410
+    return jsonify(next_jobs_page(dict(state))), 200
+
+def format_job(job, resume_terms, experience_level):
+    classification = classify_listing(
+        job.get('job_id'),
+        job.get('job_title') or '',
+        job.get('job_description') or '',
+        bool(job.get('job_is_remote'))
+    )
+    
+    return {
+        "title": job.get('job_title', 'Role'),
+        "company": job.get('employer_name', 'N/A'),
+        "description": job.get('job_description', '')[:200] + "..." if job.get('job_description') else '',
+        "url": job.get('job_apply_link', '#'),
+        "matchScore": calculate_match_score(job, resume_terms, experience_level),
+        "matchLevel": "high",
+        "requiredSkills": job.get('job_required_skills', [])[:4] if job.get('job_required_skills') else [],
+        "postedDate": format_posted_date(job.get('job_posted_at_datetime_utc', '')),
+        "experienceLevel": classification.experience_level,
+        "jobType": classification.job_type,
+        "isRemote": classification.is_remote
+    }
+
+JSEARCH_URL = os.getenv("JSEARCH_URL", "https://jsearch.p.rapidapi.com/search")
+
+def search_jsearch(search_query, page=1):
+    """Raw JSearch listings for a query, served from cache when possible.
+
+    Concurrent identical searches share one upstream request; resume scoring
+    is left to the caller so cached listings work for every user.
+    """
+    normalized = " ".join(search_query.lower().split())
+    cache_key = jobs_cache.make_key(normalized, page)
+    cached = jobs_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    def fetch():
+        url = JSEARCH_URL
+        querystring = {"query": normalized, "page": str(page), "num_pages": "1"}
+        headers = {
+            "x-rapidapi-key": os.getenv("RAPIDAPI_KEY"),
+            "x-rapidapi-host": "jsearch.p.rapidapi.com"
+        }
+        with upstream_slot('jsearch'):
+            api_res = http_client.get(url, 'jsearch', headers=headers, params=querystring)
+        api_res.raise_for_status()
+        data = api_res.json().get('data', [])
+        jobs_cache.set(cache_key, data)
+        return data
+
+    return jobs_flight.do(cache_key, fetch)
+
+# Experience levels in priority order: the first level with any hit wins
+EXPERIENCE_KEYWORDS = [
+    ('Internship', ['intern', 'interns', 'internship', 'internships', 'student', 'students']),
+    ('Entry Level', ['entry', 'entry-level', 'junior', 'graduate', 'graduates', 'associate']),
+    ('Senior', ['senior', 'sr']),
+    ('Lead', ['lead', 'principal', 'staff']),
+    ('Manager', ['manager', 'managers', 'head of', 'director', 'directors']),
+    ('Executive', ['vp', 'vice president', 'cto', 'ceo']),
+    ('Mid Level', ['mid-level', 'mid level', 'intermediate', '3-5 years', '2-4 years']),
+]
+CONTRACT_KEYWORDS = ['contract', 'contracts', 'contractor', 'contractors']
+PART_TIME_KEYWORDS = ['part-time', 'part time']
+INTERN_KEYWORDS = ['intern', 'interns', 'internship', 'internships']
+REMOTE_KEYWORDS = ['remote', 'work from home', 'wfh', 'telecommute', 'telecommuting']
+
+# Lowercases ASCII and turns every byte other than [a-z0-9] into a space, so
+# after padding the text with spaces, b" word " in text is a word-boundary match.
+# Hyphens split words too: "contract-to-hire" contains " contract ".
+_CLASSIFIER_TABLE = bytes(
+    c + 32 if 65 <= c <= 90 else c if (48 <= c <= 57 or 97 <= c <= 122) else 32
+    for c in range(256)
+)
+
+def _compile_keywords(words):
+    # Keywords go through the same table, so "part-time" matches "part time" and "Part-Time"
+    return tuple(dict.fromkeys(f" {word} ".encode('ascii').translate(_CLASSIFIER_TABLE) for word in words))
+
+_EXPERIENCE_NEEDLES = [(level, _compile_keywords(words)) for level, words in EXPERIENCE_KEYWORDS]
+_CONTRACT_NEEDLES = _compile_keywords(CONTRACT_KEYWORDS)
+_PART_TIME_NEEDLES = _compile_keywords(PART_TIME_KEYWORDS)
+_INTERN_NEEDLES = _compile_keywords(INTERN_KEYWORDS)
+_REMOTE_NEEDLES = _compile_keywords(REMOTE_KEYWORDS)
+
+JobClassification = namedtuple('JobClassification', ['experience_level', 'job_type', 'is_remote'])
+
+def _normalize_for_classifier(text):
+    return b" " + text.encode('utf-8', 'ignore').translate(_CLASSIFIER_TABLE) + b" "
+
+def classify_job(title, description, is_remote=False):
+    """Detect experience level, job type and remote flag from one normalized copy of the text.
+
+    The text is lowercased and punctuation-stripped once with a byte
+    translation table; every keyword check after that is a C-level substring
+    search that only hits on whole words ("intern" no longer matches
+    "international").
+    """
+    title_text = _normalize_for_classifier(title)
+    text = title_text + _normalize_for_classifier(description)
+
+    experience_level = next(
+        (level for level, needles in _EXPERIENCE_NEEDLES if any(n in text for n in needles)),
+        None
+    )
+
+    job_type = 'Full-time'
+    if any(n in text for n in _CONTRACT_NEEDLES):
+        job_type = 'Contract'
+    elif any(n in text for n in _PART_TIME_NEEDLES):
+        job_type = 'Part-time'
+    elif any(n in title_text for n in _INTERN_NEEDLES):
+        job_type = 'Internship'
+
+    remote = bool(is_remote) or any(n in text for n in _REMOTE_NEEDLES)
+    return JobClassification(experience_level, job_type, remote)
+
+# Keyed by JSearch job_id alone, so the memo holds small tuples rather than descriptions
+listing_classifications = ResultCache(
+    'listing_classification',
+    max_entries=4096,
+    ttl=int(os.getenv("JOB_CACHE_TTL", "1800"))
+)
+
+def classify_listing(job_id, title, description, is_remote):
+    """classify_job memoized per JSearch listing, so cached searches skip it entirely.
+
+    Listings without a job_id are classified directly.
+    """
+    if not job_id:
+        return classify_job(title, description, is_remote)
+    key = (job_id, bool(is_remote))
+    classification = listing_classifications.get(key)
+    if classification is None:
+        classification = classify_job(title, description, is_remote)
+        listing_classifications.set(key, classification)
+    return classification
 
-def calculate_match_score(job, resume, experience_level):
+def calculate_match_score(job, resume_terms, experience_level):
     score = 85
-    if resume and job.get('job_required_skills'):
-        resume_lower = resume.lower()
-        matched_skills = sum(1 for skill in job.get('job_required_skills', []) if skill.lower() in resume_lower)
+    if resume_terms and job.get('job_required_skills'):
+        matched, _ = skill_matcher.match(job.get('job_required_skills', []), resume_terms)
+        matched_skills = len(matched)
         total_skills = len(job.get('job_required_skills', []))
         if total_skills > 0:
             skill_match_percentage = (matched_skills / total_skills) * 100
@@ -530,4 +2994,6 @@ def format_posted_date(date_string):
         return 'Recently'
 
 if __name__ == '__main__':
+    with app.app_context():
+        upgrade_schema()
     app.run(host='0.0.0.0', port=5000, debug=True)
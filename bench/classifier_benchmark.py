@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark job classification: the old per-keyword substring scans vs classify_job.
+
+Builds a corpus from the job descriptions in SAMPLE_DATA.md, padded out to
+JSearch-sized descriptions with varied titles, and times the old scans,
+classify_job, and the per-listing memoized classify_listing that repeat
+(cached) searches hit.
+
+Usage: python bench/classifier_benchmark.py [--jobs 2000] [--repeat 5]
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+from app import classify_job, classify_listing
+
+TITLES = [
+    "Software Engineer", "Senior Backend Developer", "Data Science Intern",
+    "Staff Platform Engineer", "Engineering Manager", "Junior Frontend Developer",
+    "VP of Engineering", "Contract DevOps Engineer", "Part-time QA Analyst",
+    "Mid-Level Python Developer", "Principal Architect", "Graduate Analyst",
+]
+
+def legacy_classify(title, description):
+    text = (title + " " + description).lower()
+    if any(word in text for word in ['intern', 'internship', 'student']):
+        level = 'Internship'
+    elif any(word in text for word in ['entry', 'junior', 'graduate', 'associate']):
+        level = 'Entry Level'
+    elif any(word in text for word in ['senior', 'sr.', 'sr ']):
+        level = 'Senior'
+    elif any(word in text for word in ['lead', 'principal', 'staff']):
+        level = 'Lead'
+    elif any(word in text for word in ['manager', 'head of', 'director']):
+        level = 'Manager'
+    elif any(word in text for word in ['vp', 'vice president', 'cto', 'ceo']):
+        level = 'Executive'
+    elif any(word in text for word in ['mid-level', 'intermediate', '3-5 years', '2-4 years']):
+        level = 'Mid Level'
+    else:
+        level = None
+
+    job_type = 'Full-time'
+    if 'contract' in title.lower() or 'contract' in description.lower():
+        job_type = 'Contract'
+    elif 'part-time' in title.lower() or 'part-time' in description.lower():
+        job_type = 'Part-time'
+    elif 'intern' in title.lower():
+        job_type = 'Internship'
+    return level, job_type
+
+def load_corpus(size, seed=7):
+    with open(os.path.join(ROOT, "SAMPLE_DATA.md"), encoding="utf-8") as f:
+        sample = f.read()
+    sections = re.split(r"^## ", sample, flags=re.M)
+    descriptions = [
+        block
+        for section in sections if section.startswith("Sample Job Description")
+        for block in re.findall(r"```\n(.*?)```", section, flags=re.S)
+    ]
+    paragraphs = [p for d in descriptions for p in d.split("\n\n") if p.strip()]
+
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        body = "\n\n".join(rng.choice(paragraphs) for _ in range(rng.randint(6, 14)))
+        corpus.append((rng.choice(TITLES), body))
+    return corpus
+
+def run(label, fn, corpus, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in corpus:
+            fn(*item)
+        best = min(best, time.perf_counter() - start)
+    per_job = best / len(corpus) * 1e6
+    print(f"{label:<14} {best * 1000:9.1f} ms total  {per_job:8.1f} us/job")
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.jobs)
+    avg_len = sum(len(d) for _, d in corpus) / len(corpus)
+    print(f"Corpus: {len(corpus)} jobs, avg description {avg_len:.0f} chars")
+
+    legacy = run("legacy", legacy_classify, corpus, args.repeat)
+    single = run("classify_job", classify_job, corpus, args.repeat)
+    listings = [(f"job-{i}", title, description) for i, (title, description) in enumerate(corpus)]
+    for listing in listings:
+        classify_listing(*listing, False)
+    memoized = run("memoized", lambda *listing: classify_listing(*listing, False), listings, args.repeat)
+    print(f"classify_job vs legacy: {legacy / single:.2f}x   memoized vs legacy: {legacy / memoized:.2f}x")
+    if single > legacy:
+        print("Note: cold classify_job is slower than the legacy scans (whole-word matching); "
+              "only the memoized path is faster")
+
+    changed = sum(
+        1 for title, description in corpus
+        if legacy_classify(title, description) != tuple(classify_job(title, description)[:2])
+    )
+    print(f"Classifications changed by word-boundary matching: {changed}/{len(corpus)}")
+
+if __name__ == "__main__":
+    main()
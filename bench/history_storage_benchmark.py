@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Compare SavedAnalysis storage: inline JSON payloads vs content-addressed blobs.
+
+Simulates users who each run several analyses against the same resume (the
+common pattern) and stores them in a temporary SQLite database through
+app.py itself: first in the legacy inline layout, then through
+write_analyses / pack_analysis as new rows are saved. Reports file size,
+write time and full-payload read latency via unpack_analysis_data, the
+path /api/history/<id> uses.
+
+Usage: python bench/history_storage_benchmark.py [--users 50] [--analyses 40]
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def load_samples():
+    with open(os.path.join(ROOT, "SAMPLE_DATA.md"), encoding="utf-8") as f:
+        sample = f.read()
+    sections = re.split(r"^## ", sample, flags=re.M)
+    pick = lambda prefix: [
+        block
+        for section in sections if section.startswith(prefix)
+        for block in re.findall(r"```\n(.*?)```", section, flags=re.S)
+    ]
+    return pick("Sample Resume"), pick("Sample Job Description")
+
+def make_records(users, analyses, seed=11):
+    resumes, jds = load_samples()
+    rng = random.Random(seed)
+    output = {"score": 78, "verdict": "Strong match", "summary": "x" * 600,
+              "matchedSkills": ["Python", "SQL"], "missingSkills": ["Go"]}
+    records = []
+    for user in range(1, users + 1):
+        resume = rng.choice(resumes) + f"\nCandidate #{user}"
+        for _ in range(analyses):
+            records.append({
+                'user_id': user,
+                'analysis_type': 'match',
+                'data': {"resume": resume, "jd": rng.choice(jds)},
+                'result': output,
+                'created_at': datetime.utcnow()
+            })
+    return records
+
+def write_inline(app, records):
+    """Rows as versions before blob storage saved them (SavedAnalysis.storage = None)"""
+    for record in records:
+        app.db.session.add(app.SavedAnalysis(
+            user_id=record['user_id'],
+            analysis_type=record['analysis_type'],
+            created_at=record['created_at'],
+            data=json.dumps({'input': record['data'], 'output': record['result']})
+        ))
+    app.db.session.commit()
+
+def write_blobs(app, records, batch_size=50):
+    """The shipped save path: write_analyses batches, as the write-behind queue sends them"""
+    for start in range(0, len(records), batch_size):
+        written = app.write_analyses(records[start:start + batch_size])
+        assert written == len(records[start:start + batch_size]), "write_analyses dropped records"
+
+def reset(app):
+    app.db.session.execute(app.analysis_blob.delete())
+    app.SavedAnalysis.query.delete()
+    app.ContentBlob.query.delete()
+    app.db.session.commit()
+
+def vacuumed_size(app, path):
+    app.db.session.remove()
+    with app.db.engine.connect() as conn:
+        conn.exec_driver_sql("VACUUM")
+    return os.path.getsize(path)
+
+def time_reads(app, samples):
+    ids = [row.id for row in app.db.session.query(app.SavedAnalysis.id).order_by(app.SavedAnalysis.id)]
+    picked = [ids[i] for i in samples]
+    start = time.perf_counter()
+    for row_id in picked:
+        payload = app.unpack_analysis_data(app.db.session.get(app.SavedAnalysis, row_id).data)
+        app.db.session.expire_all()
+    elapsed = time.perf_counter() - start
+    assert payload['input']['resume'], "read lost the resume text"
+    return elapsed / len(picked) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--analyses", type=int, default=40)
+    args = parser.parse_args()
+
+    records = make_records(args.users, args.analyses)
+    samples = random.Random(3).sample(range(len(records)), min(2000, len(records)))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "hirevoid.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+        os.environ["RATE_LIMIT_DB"] = os.path.join(tmp, "ratelimit.db")
+        os.environ["JOB_CURSOR_DB"] = os.path.join(tmp, "job_cursors.db")
+        os.environ["WRITE_BEHIND"] = "0"
+        os.environ.setdefault("GROQ_API_KEY", "benchmark")
+        import app
+
+        results = []
+        with app.app.app_context():
+            app.upgrade_schema()
+            for user in range(1, args.users + 1):
+                app.db.session.add(app.User(id=user, email=f"user{user}@example.com"))
+            app.db.session.commit()
+
+            for label, writer in [("inline", write_inline), ("blobs", write_blobs)]:
+                reset(app)
+                start = time.perf_counter()
+                writer(app, records)
+                write_ms = (time.perf_counter() - start) * 1000
+                size = vacuumed_size(app, path)
+                results.append((label, size, write_ms, time_reads(app, samples)))
+            app.db.session.remove()
+            app.db.engine.dispose()
+
+    print(f"{len(records)} analyses from {args.users} users")
+    for label, size, write_ms, read_us in results:
+        print(f"{label:<8} {size / 1024:10.0f} KiB   {write_ms:8.0f} ms write   "
+              f"{read_us:7.1f} us per full-payload read")
+    print(f"Size reduction: {results[0][1] / results[1][1]:.1f}x")
+
+if __name__ == "__main__":
+    main()
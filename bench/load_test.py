@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Load-test HireVoid under gunicorn against local stand-ins for Groq and JSearch.
+
+Starts one fake upstream server (Groq chat completions + JSearch search) with
+configurable latency and error rate, then for each worker configuration boots
+gunicorn with gunicorn.conf.py on a throwaway SQLite database, seeds users,
+and drives a weighted mix of analyze-resume, analyze-match, find-linkedin-jobs
+and history requests from logged-in sessions. Reports p50/p95/p99 latency and
+requests/sec per endpoint.
+
+Usage: python bench/load_test.py [--configs gevent:1,gevent:2] [--concurrency 20]
+                                 [--duration 30] [--groq-latency 0.8]
+                                 [--jsearch-latency 0.3] [--error-rate 0.02]
+                                 [--mix resume=3,match=3,jobs=2,history=4]
+                                 [--json results.json]
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import signal
+import socket
+import sqlite3
+import argparse
+import tempfile
+import threading
+import subprocess
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from flask import Flask
+from flask.sessions import SecureCookieSessionInterface
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SECRET_KEY = "load-test-secret"
+ROLES = ["Python Developer", "Data Scientist", "Frontend Engineer", "DevOps Engineer", "Product Manager"]
+LOCATIONS = ["Bangalore", "Remote", "New York", "London", "Berlin"]
+
+def load_samples():
+    with open(os.path.join(ROOT, "SAMPLE_DATA.md"), encoding="utf-8") as f:
+        sample = f.read()
+    sections = re.split(r"^## ", sample, flags=re.M)
+    pick = lambda prefix: [
+        block
+        for section in sections if section.startswith(prefix)
+        for block in re.findall(r"```\n(.*?)```", section, flags=re.S)
+    ]
+    return pick("Sample Resume"), pick("Sample Job Description")
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+# ============================================
+# FAKE UPSTREAMS
+# ============================================
+
+FAKE_RESUME = {
+    "rating": 7, "strengths": "Solid backend experience.", "improvements": "Quantify impact.",
+    "skills": ["Python", "SQL", "Docker"],
+    "suggestions": [{"title": "Add metrics", "description": "Show results.", "type": "info"}],
+}
+FAKE_MATCH = {
+    "score": 72, "verdict": "Good match", "summary": "Most requirements are covered.",
+    "matchedSkills": ["Python", "SQL"], "missingSkills": ["Kubernetes"],
+    "breakdown": {"skills": 70, "experience": 75, "keywords": 68},
+    "suggestions": [{"title": "Mention Kubernetes", "description": "If applicable.", "type": "warning"}],
+}
+FAKE_JD = {
+    "overview": "Backend role.", "mustHaveSkills": ["Python"], "niceToHaveSkills": ["Go"],
+    "responsibilities": ["Build APIs"], "preparationTips": ["Review system design"],
+}
+
+def fake_jobs(query, count=10):
+    return [
+        {
+            "job_id": f"{abs(hash(query)) % 100000}-{i}",
+            "job_title": f"{'Senior ' if i % 3 == 0 else ''}{query.split(' in ')[0]}",
+            "employer_name": f"Company {i}",
+            "job_description": "We need Python, SQL, Docker and AWS experience. " * 20,
+            "job_apply_link": f"https://example.com/jobs/{i}",
+            "job_is_remote": i % 4 == 0,
+            "job_required_skills": ["Python", "SQL", "AWS"],
+            "job_posted_at_datetime_utc": datetime.utcnow().isoformat() + "Z",
+        }
+        for i in range(count)
+    ]
+
+class FakeUpstreamHandler(BaseHTTPRequestHandler):
+    """Answers /openai/v1/chat/completions like Groq and /search like JSearch"""
+
+    protocol_version = "HTTP/1.1"
+    config = {}
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _delay_or_fail(self, latency, error_status):
+        time.sleep(latency * random.uniform(0.5, 1.5))
+        if random.random() < self.config["error_rate"]:
+            self._send(error_status, {"error": {"message": "injected failure"}}, {"Retry-After": "1"})
+            return True
+        return False
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.endswith("/chat/completions"):
+            return self._send(404, {"error": "not found"})
+        started = time.perf_counter()
+        if self._delay_or_fail(self.config["groq_latency"], random.choice([429, 500])):
+            return
+        system = body["messages"][0]["content"]
+        result = FAKE_RESUME if "'rating'" in system else FAKE_MATCH if "'score'" in system else FAKE_JD
+        content = json.dumps(result)
+        elapsed = time.perf_counter() - started
+        prompt_tokens = sum(len(m["content"]) for m in body["messages"]) // 4
+        self._send(200, {
+            "id": "chatcmpl-load-test",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": prompt_tokens + len(content) // 4,
+                "total_time": elapsed,
+                "completion_time": elapsed * 0.8,
+            },
+        })
+
+    def do_GET(self):
+        if not self.path.startswith("/search"):
+            return self._send(404, {"error": "not found"})
+        if self._delay_or_fail(self.config["jsearch_latency"], 503):
+            return
+        query = requests.utils.unquote(self.path.split("query=", 1)[-1].split("&", 1)[0]).replace("+", " ")
+        self._send(200, {"status": "OK", "data": fake_jobs(query)})
+
+def start_fake_upstream(groq_latency, jsearch_latency, error_rate):
+    FakeUpstreamHandler.config = {
+        "groq_latency": groq_latency, "jsearch_latency": jsearch_latency, "error_rate": error_rate,
+    }
+    server = ThreadingHTTPServer(("127.0.0.1", free_port()), FakeUpstreamHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# ============================================
+# APP UNDER TEST
+# ============================================
+
+def session_cookie(user_id):
+    """Signed Flask session cookie for a logged-in Flask-Login user"""
+    signer_app = Flask("load_test")
+    signer_app.secret_key = SECRET_KEY
+    signer = SecureCookieSessionInterface().get_signing_serializer(signer_app)
+    return signer.dumps({"_user_id": str(user_id), "_fresh": True})
+
+def seed_users(db_path, count):
+    now = datetime.utcnow().isoformat(" ")
+    with sqlite3.connect(db_path, timeout=15) as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO user (id, email, name, provider, provider_id, created_at, last_login) "
+            "VALUES (?, ?, ?, 'load-test', ?, ?, ?)",
+            [(i, f"load{i}@example.com", f"Load User {i}", str(i), now, now) for i in range(1, count + 1)]
+        )
+
+def start_app(worker_class, workers, upstream_url, workdir):
+    port = free_port()
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        SECRET_KEY=SECRET_KEY,
+        WEB_CONCURRENCY=str(workers),
+        GUNICORN_WORKER_CLASS=worker_class,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'hirevoid.db')}",
+        RATE_LIMIT_DB=os.path.join(workdir, "ratelimit.db"),
+        JOB_CURSOR_DB=os.path.join(workdir, "job_cursors.db"),
+        # In-memory LLM/job caches only, so no state carries over between configurations
+        LLM_CACHE_DB="",
+        GROQ_API_KEY="load-test",
+        GROQ_BASE_URL=upstream_url,
+        RAPIDAPI_KEY="load-test",
+        JSEARCH_URL=f"{upstream_url}/search",
+    )
+    # Measure the hot paths, not the per-user quotas
+    env.setdefault("GROQ_USER_RATE_PER_MIN", "100000")
+    env.setdefault("GROQ_USER_BURST", "100000")
+    env.setdefault("JSEARCH_USER_RATE_PER_MIN", "100000")
+    env.setdefault("JSEARCH_USER_BURST", "100000")
+    log = open(os.path.join(workdir, f"gunicorn-{worker_class}-{workers}.log"), "w")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:app"],
+        cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited early, see {log.name}")
+        try:
+            if requests.get(f"{base_url}/metrics", timeout=1).status_code == 200:
+                return process, base_url, log
+        except requests.exceptions.RequestException:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"gunicorn did not come up, see {log.name}")
+
+def stop_app(process, log):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=40)
+    except subprocess.TimeoutExpired:
+        process.kill()
+    log.close()
+
+# ============================================
+# LOAD DRIVER
+# ============================================
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, weight = part.split("=")
+        mix[name.strip()] = float(weight)
+    unknown = set(mix) - {"resume", "match", "jobs", "history"}
+    if unknown:
+        raise SystemExit(f"Unknown endpoints in --mix: {', '.join(sorted(unknown))}")
+    return mix
+
+def build_request(kind, rng, resumes, jds, repeat_ratio):
+    # A share of requests reuse identical text so the result caches see realistic hits
+    salt = "" if rng.random() < repeat_ratio else f"\nRef {rng.getrandbits(32)}"
+    resume = rng.choice(resumes) + salt
+    if kind == "resume":
+        return "POST", "/api/analyze-resume", {"resume": resume}
+    if kind == "match":
+        return "POST", "/api/analyze-match", {"resume": resume, "jd": rng.choice(jds)}
+    if kind == "jobs":
+        return "POST", "/api/find-linkedin-jobs", {
+            "role": rng.choice(ROLES), "location": rng.choice(LOCATIONS), "resume": resume,
+        }
+    return "GET", "/api/history?limit=20", None
+
+def run_client(index, base_url, users, mix, stop_at, measure_from, samples, resumes, jds, repeat_ratio):
+    rng = random.Random(index)
+    http = requests.Session()
+    http.cookies.set("session", session_cookie(index % users + 1))
+    kinds, weights = list(mix), list(mix.values())
+    while time.time() < stop_at:
+        kind = rng.choices(kinds, weights)[0]
+        method, path, payload = build_request(kind, rng, resumes, jds, repeat_ratio)
+        started = time.perf_counter()
+        try:
+            status = http.request(method, base_url + path, json=payload, timeout=120).status_code
+        except requests.exceptions.RequestException:
+            status = 0
+        elapsed = time.perf_counter() - started
+        if time.time() >= measure_from:
+            samples.append((kind, elapsed, status))
+
+def percentile(ordered, q):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def summarize(samples, duration):
+    rows = {}
+    for kind in sorted({kind for kind, _, _ in samples}) + ["total"]:
+        picked = [s for s in samples if kind == "total" or s[0] == kind]
+        ordered = sorted(elapsed for _, elapsed, _ in picked)
+        rows[kind] = {
+            "requests": len(picked),
+            "errors": sum(1 for _, _, status in picked if status == 0 or status >= 400),
+            "p50Ms": round(percentile(ordered, 0.50) * 1000, 1) if ordered else None,
+            "p95Ms": round(percentile(ordered, 0.95) * 1000, 1) if ordered else None,
+            "p99Ms": round(percentile(ordered, 0.99) * 1000, 1) if ordered else None,
+            "reqPerSec": round(len(picked) / duration, 2),
+        }
+    return rows
+
+def run_config(worker_class, workers, args, upstream_url, resumes, jds):
+    with tempfile.TemporaryDirectory() as workdir:
+        process, base_url, log = start_app(worker_class, workers, upstream_url, workdir)
+        try:
+            seed_users(os.path.join(workdir, "hirevoid.db"), args.users)
+            samples = []
+            measure_from = time.time() + args.warmup
+            stop_at = measure_from + args.duration
+            threads = [
+                threading.Thread(target=run_client, args=(
+                    i, base_url, args.users, args.mix, stop_at, measure_from, samples, resumes, jds, args.repeat_ratio))
+                for i in range(args.concurrency)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            stop_app(process, log)
+    return summarize(samples, args.duration)
+
+def print_report(label, rows):
+    print(f"\n{label}")
+    print(f"  {'endpoint':<10} {'requests':>9} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8}")
+    for kind, row in rows.items():
+        print(f"  {kind:<10} {row['requests']:>9} {row['errors']:>7} {row['p50Ms'] or '-':>9} "
+              f"{row['p95Ms'] or '-':>9} {row['p99Ms'] or '-':>9} {row['reqPerSec']:>8}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--configs", default="gevent:1,gevent:2",
+                        help="comma-separated worker_class:workers pairs")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent simulated clients")
+    parser.add_argument("--users", type=int, default=10, help="distinct logged-in users")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds per config")
+    parser.add_argument("--warmup", type=float, default=3, help="unmeasured seconds before each run")
+    parser.add_argument("--groq-latency", type=float, default=0.8, help="mean fake Groq latency (s)")
+    parser.add_argument("--jsearch-latency", type=float, default=0.3, help="mean fake JSearch latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="share of upstream calls that fail")
+    parser.add_argument("--repeat-ratio", type=float, default=0.3, help="share of requests reusing identical input")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("resume=3,match=3,jobs=2,history=4"))
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    resumes, jds = load_samples()
+    upstream = start_fake_upstream(args.groq_latency, args.jsearch_latency, args.error_rate)
+    upstream_url = f"http://127.0.0.1:{upstream.server_address[1]}"
+    print(f"Fake Groq/JSearch on {upstream_url} (groq {args.groq_latency}s, jsearch {args.jsearch_latency}s, "
+          f"errors {args.error_rate:.0%}); {args.concurrency} clients, {args.duration}s per config")
+
+    results = {}
+    for config in args.configs.split(","):
+        worker_class, workers = config.split(":")
+        label = f"{worker_class} x{workers}"
+        results[label] = run_config(worker_class, int(workers), args, upstream_url, resumes, jds)
+        print_report(label, results[label])
+
+    upstream.shutdown()
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
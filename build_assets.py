@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Build fingerprinted, precompressed static bundles into static/dist.
+
+- Compiles Tailwind ahead of time (base layer plus any utilities used in
+  templates/ and static/*.js) instead of loading the Play CDN runtime.
+- Minifies style.css, auth-styles.css, script.js and auth.js.
+- Names each bundle <name>.<content hash>.<ext> and writes .gz and .br
+  variants next to it.
+- Writes static/dist/manifest.json, which app.py uses to link the bundles
+  and serve them with immutable caching.
+
+Run once per deploy, after installing requirements-build.txt:
+
+    python build_assets.py
+
+The Tailwind step runs TAILWIND_CLI (default "tailwindcss": the standalone
+binary, or the wrapper installed by pytailwindcss). --skip-tailwind builds
+everything else; pages then keep using the Tailwind CDN runtime.
+"""
+import os
+import sys
+import gzip
+import json
+import shlex
+import hashlib
+import argparse
+import tempfile
+import subprocess
+
+import brotli
+import rcssmin
+import rjsmin
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(ROOT, "static")
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST = "manifest.json"
+
+# Source file (relative to static/) -> minifier
+SOURCES = {
+    "style.css": rcssmin.cssmin,
+    "auth-styles.css": rcssmin.cssmin,
+    "script.js": rjsmin.jsmin,
+    "auth.js": rjsmin.jsmin,
+}
+
+def compile_tailwind():
+    cli = shlex.split(os.getenv("TAILWIND_CLI", "tailwindcss"))
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "tailwind.css")
+        command = cli + [
+            "-c", os.path.join(ROOT, "tailwind.config.js"),
+            "-i", os.path.join(ROOT, "assets", "tailwind.css"),
+            "-o", output,
+            "--minify",
+        ]
+        try:
+            # pytailwindcss downloads this release; the config and @tailwind directives are v3 syntax
+            env = dict(os.environ, TAILWINDCSS_VERSION=os.getenv("TAILWINDCSS_VERSION", "v3.4.17"))
+            subprocess.run(command, cwd=ROOT, env=env, check=True)
+        except FileNotFoundError:
+            sys.exit(f"Tailwind CLI not found ({cli[0]}). Install requirements-build.txt, "
+                     "set TAILWIND_CLI, or pass --skip-tailwind.")
+        except subprocess.CalledProcessError as e:
+            sys.exit(f"Tailwind build failed (exit {e.returncode}).")
+        with open(output, encoding="utf-8") as f:
+            return f.read()
+
+def fingerprinted_name(name, content):
+    stem, ext = os.path.splitext(name)
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    return f"{stem}.{digest}{ext}"
+
+def write_bundle(name, text):
+    content = text.encode("utf-8")
+    filename = fingerprinted_name(name, content)
+    path = os.path.join(DIST_DIR, filename)
+    with open(path, "wb") as f:
+        f.write(content)
+    # mtime=0 keeps the .gz byte-identical across builds of the same content
+    with open(path + ".gz", "wb") as f:
+        f.write(gzip.compress(content, compresslevel=9, mtime=0))
+    with open(path + ".br", "wb") as f:
+        f.write(brotli.compress(content, quality=11))
+    return filename, len(content)
+
+def remove_stale(keep):
+    for filename in os.listdir(DIST_DIR):
+        base = filename[:-3] if filename.endswith((".gz", ".br")) else filename
+        if base not in keep and filename != MANIFEST:
+            os.remove(os.path.join(DIST_DIR, filename))
+
+def main():
+    parser = argparse.ArgumentParser(description="Build fingerprinted static bundles into static/dist")
+    parser.add_argument("--skip-tailwind", action="store_true", help="keep using the Tailwind CDN runtime")
+    args = parser.parse_args()
+
+    os.makedirs(DIST_DIR, exist_ok=True)
+    bundles = {}
+    if not args.skip_tailwind:
+        bundles["tailwind.css"] = compile_tailwind()
+    for name, minify in SOURCES.items():
+        with open(os.path.join(STATIC_DIR, name), encoding="utf-8") as f:
+            source = f.read()
+        bundles[name] = minify(source)
+
+    manifest = {}
+    for name, text in bundles.items():
+        manifest[name], size = write_bundle(name, text)
+        print(f"{name:<16} -> dist/{manifest[name]} ({size / 1024:.1f} KB)")
+
+    remove_stale(set(manifest.values()))
+    with open(os.path.join(DIST_DIR, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Gunicorn settings for HireVoid.
+
+Almost all request time is spent waiting on Groq and RapidAPI, so the default
+worker class is gevent: each worker multiplexes many in-flight upstream calls
+instead of blocking a whole process per request. Set GUNICORN_WORKER_CLASS=gthread
+to fall back to a threaded worker where gevent is unavailable.
+"""
+import os
+import sys
+import subprocess
+import multiprocessing
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gevent")
+workers = int(os.getenv("WEB_CONCURRENCY", max(2, multiprocessing.cpu_count())))
+
+# gevent: concurrent greenlets per worker
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "200"))
+# gthread: threads per worker
+threads = int(os.getenv("GUNICORN_THREADS", "16"))
+
+# LLM completions and SSE streams can legitimately run for tens of seconds
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers periodically to bound memory growth of in-process caches
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = 200
+
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    """Apply schema migrations once in the master, before any worker serves traffic"""
+    if os.getenv("AUTO_MIGRATE", "1") != "0":
+        subprocess.run([sys.executable, "-m", "flask", "--app", "app", "upgrade-db"], check=True)
+
+
+def worker_exit(server, worker):
+    """Finish this worker's background jobs, then commit analyses still in its write-behind queue"""
+    from app import job_runner, persistence_queue
+    job_runner.shutdown()
+    persistence_queue.flush(timeout=graceful_timeout - 5)
@@ -39,50 +39,88 @@ function requireLogin(action) {
 }
 
 // ============================================
-// PDF TEXT EXTRACTION
+// RESUME UPLOAD
 // ============================================
+// Signed-in users upload PDF/DOCX to the server, which parses it once and
+// returns a resumeId; analyses then send that id instead of the full text.
+// Signed-out visitors fall back to extracting PDF text in the browser.
+async function uploadResumeFile(file) {
+    const form = new FormData();
+    form.append('file', file);
+    const res = await fetch('/api/resumes', { method: 'POST', body: form });
+    const data = await res.json();
+    if (!res.ok) {
+        throw new Error(data.error || 'Upload failed');
+    }
+    return data;
+}
+
+async function extractPdfText(file) {
+    const typedarray = new Uint8Array(await file.arrayBuffer());
+    const pdf = await pdfjsLib.getDocument(typedarray).promise;
+    let fullText = "";
+
+    for (let i = 1; i <= pdf.numPages; i++) {
+        const page = await pdf.getPage(i);
+        const textContent = await page.getTextContent();
+        const pageText = textContent.items.map(item => item.str).join(" ");
+        fullText += pageText + "\n\n";
+    }
+    return fullText.trim();
+}
+
+// { resume_id } while the textarea still holds the uploaded text, else { resume }
+function resumePayload(textareaId) {
+    const area = document.getElementById(textareaId);
+    const text = area.value.trim();
+    if (area.dataset.resumeId && text === area.dataset.resumeText) {
+        return { resume_id: area.dataset.resumeId };
+    }
+    return { resume: text || null };
+}
+
 document.querySelectorAll('.pdf-upload').forEach(input => {
     input.addEventListener('change', async (e) => {
         const file = e.target.files[0];
         const targetId = e.target.getAttribute('data-target');
         const targetArea = document.getElementById(targetId);
         const uploadLabel = e.target.previousElementSibling;
+        const isDocx = file && file.name.toLowerCase().endsWith('.docx');
+
+        if (!file || (file.type !== "application/pdf" && !isDocx)) {
+            return;
+        }
+        if (isDocx && !isAuthenticated) {
+            requireLogin('upload Word resumes');
+            return;
+        }
+
+        targetArea.placeholder = "Extracting text from resume... please wait.";
+        if (uploadLabel) {
+            uploadLabel.querySelector('strong').textContent = "Processing resume...";
+        }
+
+        try {
+            if (isAuthenticated) {
+                const uploaded = await uploadResumeFile(file);
+                targetArea.value = uploaded.text;
+                targetArea.dataset.resumeId = uploaded.resumeId;
+                targetArea.dataset.resumeText = uploaded.text.trim();
+            } else {
+                targetArea.value = await extractPdfText(file);
+                delete targetArea.dataset.resumeId;
+            }
 
-        if (file && file.type === "application/pdf") {
-            targetArea.placeholder = "Extracting text from PDF... please wait.";
             if (uploadLabel) {
-                uploadLabel.querySelector('strong').textContent = "Processing PDF...";
+                uploadLabel.querySelector('strong').textContent = `✓ ${file.name}`;
+                uploadLabel.style.borderColor = '#10b981';
+                uploadLabel.style.background = 'rgba(16, 185, 129, 0.05)';
+            }
+        } catch (err) {
+            alert("Error reading resume: " + err.message);
+            if (uploadLabel) {
+                uploadLabel.querySelector('strong').textContent = "Drop PDF or click to upload";
             }
-            
-            const reader = new FileReader();
-            
-            reader.onload = async function() {
-                try {
-                    const typedarray = new Uint8Array(this.result);
-                    const pdf = await pdfjsLib.getDocument(typedarray).promise;
-                    let fullText = "";
-                    
-                    for (let i = 1; i <= pdf.numPages; i++) {
-                        const page = await pdf.getPage(i);
-                        const textContent = await page.getTextContent();
-                        const pageText = textContent.items.map(item => item.str).join(" ");
-                        fullText += pageText + "\n\n";
-                    }
-                    
-                    targetArea.value = fullText.trim();
-                    if (uploadLabel) {
-                        uploadLabel.querySelector('strong').textContent = `✓ ${file.name}`;
-                        uploadLabel.style.borderColor = '#10b981';
-                        uploadLabel.style.background = 'rgba(16, 185, 129, 0.05)';
-                    }
-                } catch (err) {
-                    alert("Error reading PDF: " + err.message);
-                    if (uploadLabel) {
-                        uploadLabel.querySelector('strong').textContent = "Drop PDF or click to upload";
-                    }
-                }
-            };
-            reader.readAsArrayBuffer(file);
         }
     });
 });
@@ -116,6 +154,59 @@ function applyQuickFilter(filterType) {
     showNotification(`Filter "${filterType}" applied!`, "success");
 }
 
+// ============================================
+// STREAMED ANALYSIS (SSE)
+// ============================================
+// Posts to an analysis endpoint in streaming mode and calls onField(key, value)
+// for each top-level result field as soon as the server has it.
+async function streamAnalysis(url, payload, onField) {
+    const res = await fetch(`${url}?stream=1`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream' },
+        body: JSON.stringify(payload)
+    });
+
+    if (!res.ok || !res.body) {
+        return { status: res.status, data: null };
+    }
+
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let result = null;
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const frame = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            let data = '';
+            frame.split('\n').forEach(line => {
+                if (line.startsWith('event:')) event = line.slice(6).trim();
+                else if (line.startsWith('data:')) data += line.slice(5).trim();
+            });
+            if (!data) continue;
+
+            const parsed = JSON.parse(data);
+            if (event === 'field' && onField) {
+                onField(parsed.key, parsed.value);
+            } else if (event === 'done') {
+                result = parsed;
+            } else if (event === 'error') {
+                throw new Error(parsed.error || "Analysis failed");
+            }
+        }
+    }
+
+    return { status: res.status, data: result };
+}
+
 // ============================================
 // MATCH ANALYSIS (LOGIN REQUIRED)
 // ============================================
@@ -139,25 +230,39 @@ async function analyzeMatch() {
     resultDiv.classList.remove('show');
 
     try {
-        const res = await fetch('/api/analyze-match', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ resume, jd })
+        let scoreShown = false;
+        const { status, data } = await streamAnalysis('/api/analyze-match', { ...resumePayload('resume-match'), jd }, (key, value) => {
+            if (key === 'provisional') {
+                // Instant local estimate; replaced when the AI analysis arrives
+                document.getElementById('match-score').textContent = value.score || 0;
+                document.getElementById('matched-skills').innerHTML = (value.matchedSkills || [])
+                    .map(s => `<span class="skill-tag skill-matched">${s}</span>`).join('');
+                document.getElementById('missing-skills').innerHTML = (value.missingSkills || [])
+                    .map(s => `<span class="skill-tag skill-missing">${s}</span>`).join('');
+                document.getElementById('analysis-text').textContent = "Quick estimate - detailed AI analysis in progress...";
+                loader.classList.remove('show');
+                resultDiv.classList.add('show');
+            } else if (key === 'score') {
+                animateScore(value || 0);
+                scoreShown = true;
+                loader.classList.remove('show');
+                resultDiv.classList.add('show');
+            } else if (key === 'verdict' || key === 'summary') {
+                document.getElementById('analysis-text').textContent = value || "";
+            }
         });
 
-        if (res.status === 401) {
+        if (status === 401) {
             // User is not authenticated
             isAuthenticated = false;
             requireLogin('analyze match');
             return;
         }
 
-        if (!res.ok) throw new Error("Server responded with error");
-        
-        const data = await res.json();
+        if (status !== 200 || !data) throw new Error("Server responded with error");
 
         // Animate main score
-        animateScore(data.score || 0);
+        if (!scoreShown) animateScore(data.score || 0);
         
         document.getElementById('match-score').textContent = data.score || 0;
         
@@ -225,23 +330,27 @@ async function reviewResume() {
     resultDiv.classList.remove('show');
 
     try {
-        const res = await fetch('/api/analyze-resume', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ resume })
+        let ratingShown = false;
+        const { status, data } = await streamAnalysis('/api/analyze-resume', resumePayload('resume-review'), (key, value) => {
+            if (key === 'rating') {
+                animateRating(value || 0);
+                ratingShown = true;
+                loader.classList.remove('show');
+                resultDiv.classList.add('show');
+            } else if (key === 'strengths') {
+                document.getElementById('strengths-text').textContent = value || "";
+            }
         });
 
-        if (res.status === 401) {
+        if (status === 401) {
             isAuthenticated = false;
             requireLogin('review resume');
             return;
         }
 
-        if (!res.ok) throw new Error("Server responded with error");
-        
-        const data = await res.json();
+        if (status !== 200 || !data) throw new Error("Server responded with error");
 
-        animateRating(data.rating || 0);
+        if (!ratingShown) animateRating(data.rating || 0);
         
         document.getElementById('strengths-text').textContent = data.strengths || "";
         document.getElementById('improvements-text').textContent = data.improvements || "";
@@ -292,21 +401,23 @@ async function analyzeJD() {
     resultDiv.classList.remove('show');
 
     try {
-        const res = await fetch('/api/analyze-jd', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ jd })
+        const { status, data } = await streamAnalysis('/api/analyze-jd', { jd }, (key, value) => {
+            if (key === 'mustHaveSkills' && Array.isArray(value)) {
+                document.getElementById('must-have-skills').innerHTML = value
+                    .map((s, i) => `<span class="skill-tag skill-matched" style="animation-delay: ${i * 0.1}s">${s}</span>`)
+                    .join('');
+                loader.classList.remove('show');
+                resultDiv.classList.add('show');
+            }
         });
 
-        if (res.status === 401) {
+        if (status === 401) {
             isAuthenticated = false;
             requireLogin('analyze job description');
             return;
         }
 
-        if (!res.ok) throw new Error("Server responded with error");
-        
-        const data = await res.json();
+        if (status !== 200 || !data) throw new Error("Server responded with error");
 
         document.getElementById('overview').innerHTML = `
             <h3 style="margin-bottom: 15px; font-size: 1.3rem;">📋 Role Overview</h3>
@@ -423,7 +534,6 @@ async function getLinkedInJobs() {
     const jobRole = document.getElementById('job-role').value.trim();
     const location = document.getElementById('job-location').value.trim();
     const experienceLevel = document.getElementById('experience-level').value;
-    const resumeText = document.getElementById('resume-linkedin').value.trim();
     
     if (!jobRole) {
         showNotification("Please enter a job role to search for", "warning");
@@ -449,7 +559,7 @@ async function getLinkedInJobs() {
                 role: jobRole,
                 location: location,
                 experienceLevel: experienceLevel,
-                resume: resumeText || null
+                ...resumePayload('resume-linkedin')
             })
         });
 
@@ -515,6 +625,7 @@ function displayLinkedInJobs(data, jobRole, location, experienceLevel) {
     const jobsContainer = document.getElementById('jobs-container');
     
     if (!data.jobs || data.jobs.length === 0) {
+        renderLoadMore(null);
         jobsContainer.innerHTML = `
             <div class="no-jobs-found">
                 <i class="fas fa-search" style="font-size: 3rem; color: #64748b; margin-bottom: 1rem;"></i>
@@ -534,7 +645,12 @@ function displayLinkedInJobs(data, jobRole, location, experienceLevel) {
         return;
     }
     
-    jobsContainer.innerHTML = data.jobs.map((job, i) => `
+    jobsContainer.innerHTML = data.jobs.map(renderJobCard).join('');
+    renderLoadMore(data.nextCursor);
+}
+
+function renderJobCard(job, i) {
+    return `
         <div class="job-card" style="animation-delay: ${i * 0.1}s">
             <div class="job-header">
                 <h4>${job.title}</h4>
@@ -550,6 +666,11 @@ function displayLinkedInJobs(data, jobRole, location, experienceLevel) {
                     <i class="fas fa-chart-line"></i> ${job.experienceLevel}
                 </p>
             ` : ''}
+            ${job.isRemote ? `
+                <p class="job-company">
+                    <i class="fas fa-globe"></i> Remote
+                </p>
+            ` : ''}
             ${job.description ? `<p class="job-description">${job.description}</p>` : ''}
             ${job.requiredSkills && job.requiredSkills.length > 0 ? `
                 <div class="job-skills">
@@ -561,7 +682,43 @@ function displayLinkedInJobs(data, jobRole, location, experienceLevel) {
                 <i class="fas fa-external-link-alt"></i> Apply Now
             </a>
         </div>
-    `).join('');
+    `;
+}
+
+// Adds (or removes) the "Load more" button for the next page of a search
+function renderLoadMore(nextCursor) {
+    const existing = document.getElementById('load-more-jobs');
+    if (existing) existing.remove();
+    if (!nextCursor) return;
+
+    const button = document.createElement('button');
+    button.id = 'load-more-jobs';
+    button.className = 'job-link';
+    button.innerHTML = '<i class="fas fa-plus"></i> Load more jobs';
+    button.onclick = () => loadMoreJobs(nextCursor);
+    document.getElementById('jobs-container').after(button);
+}
+
+async function loadMoreJobs(cursor) {
+    const button = document.getElementById('load-more-jobs');
+    if (button) button.disabled = true;
+
+    try {
+        const res = await fetch('/api/find-linkedin-jobs', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ cursor })
+        });
+        const data = await res.json();
+        if (!res.ok) throw new Error(data.error || "Failed to fetch more jobs");
+
+        const jobsContainer = document.getElementById('jobs-container');
+        jobsContainer.insertAdjacentHTML('beforeend', data.jobs.map(renderJobCard).join(''));
+        renderLoadMore(data.nextCursor);
+    } catch (e) {
+        showNotification("Search Error: " + e.message, "error");
+        if (button) button.disabled = false;
+    }
 }
 
 // ============================================
@@ -0,0 +1,8 @@
+/** @type {import('tailwindcss').Config} */
+module.exports = {
+  content: ['./templates/**/*.html', './static/*.js'],
+  theme: {
+    extend: {},
+  },
+  plugins: [],
+};
@@ -0,0 +1,13 @@
+import os
+import sys
+import tempfile
+
+# app.py reads its settings and builds its Groq client at import time;
+# keep every store the tests touch in a throwaway directory
+_workdir = tempfile.mkdtemp(prefix="hirevoid-tests-")
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_workdir, 'hirevoid.db')}")
+os.environ.setdefault("RATE_LIMIT_DB", os.path.join(_workdir, "ratelimit.db"))
+os.environ.setdefault("JOB_CURSOR_DB", os.path.join(_workdir, "job_cursors.db"))
+os.environ.setdefault("WRITE_BEHIND", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
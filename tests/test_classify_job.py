@@ -0,0 +1,39 @@
+import pytest
+
+from app import classify_job, classify_listing, listing_classifications
+
+@pytest.mark.parametrize("title, description, job_type", [
+    ("Software Engineer", "Contract-to-hire role on the payments team", "Contract"),
+    ("Backend Developer (Contract)", "", "Contract"),
+    ("QA Analyst", "This is a part-time position", "Part-time"),
+    ("QA Analyst", "Part time, 20 hours a week", "Part-time"),
+    ("Data Science Intern", "Summer program", "Internship"),
+    ("Platform Engineer", "Full-time, permanent", "Full-time"),
+])
+def test_job_type(title, description, job_type):
+    assert classify_job(title, description).job_type == job_type
+
+@pytest.mark.parametrize("title, description, level", [
+    ("Entry-Level Analyst", "", "Entry Level"),
+    ("Developer", "Mid-level engineer with 3-5 years of experience", "Mid Level"),
+    ("Sr. Data Engineer", "", "Senior"),
+    ("Engineer", "Join our international team", None),
+])
+def test_experience_level(title, description, level):
+    assert classify_job(title, description).experience_level == level
+
+def test_remote_flag():
+    assert classify_job("Engineer", "Work from home anywhere in the US").is_remote
+    assert classify_job("Engineer", "On-site", is_remote=True).is_remote
+    assert not classify_job("Engineer", "On-site in Austin").is_remote
+
+def test_listing_memo_keyed_on_job_id():
+    first = classify_listing("memo-1", "Sr. Engineer", "Contract role", False)
+    assert classify_listing("memo-1", "Intern", "", False) is first
+    assert all(isinstance(key, tuple) and len(key) == 2 for key in listing_classifications._entries)
+
+def test_listing_without_job_id_is_not_memoized():
+    before = listing_classifications.stats()['size']
+    assert classify_listing(None, "Data Science Intern", "", False).job_type == "Internship"
+    assert classify_listing("", "Sr. Data Engineer", "", False).experience_level == "Senior"
+    assert listing_classifications.stats()['size'] == before
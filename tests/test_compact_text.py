@@ -0,0 +1,37 @@
+from app import compact_text, prepare_prompt_text
+
+def test_keeps_years_and_bare_numbers():
+    text = "Education\n2019\nBSc Computer Science\n42\nprojects shipped"
+    assert compact_text(text) == text
+
+def test_drops_page_number_forms():
+    text = "Summary\nPage 1\nSkills\n2 of 3\nExperience\nPage 3 of 3\n- 4 -\nEnd"
+    assert compact_text(text) == "Summary\nSkills\nExperience\nEnd"
+
+def test_keeps_lines_that_repeat_a_few_times():
+    text = "Acme Corp\nResponsibilities:\nBuilt APIs\nGlobex\nResponsibilities:\nRan deploys"
+    assert compact_text(text) == text
+
+def test_drops_running_headers_after_first_occurrence():
+    header = "Jane Doe | jane@example.com"
+    text = "\n".join([header, "Summary", header, "Experience", header, "Skills"])
+    assert compact_text(text) == "\n".join([header, "Summary", "Experience", "Skills"])
+
+def test_collapses_whitespace_and_blank_lines():
+    assert compact_text("  Python \t and Go  \n\n\n\nSQL\n") == "Python and Go\n\nSQL"
+    assert compact_text(None) == ""
+
+def test_truncation_keeps_long_single_line_text():
+    page = " ".join(f"word{i}" for i in range(2500))
+    text = prepare_prompt_text("John Doe\n" + page, 1000)
+    assert text.startswith("John Doe\nword0 word1")
+    assert text.endswith("\n[truncated]")
+    body = text[:-len("\n[truncated]")]
+    assert 0.85 * 4000 <= len(body) <= 4000
+    assert body.split()[-1] in page.split()
+
+def test_truncation_prefers_a_nearby_line_break():
+    lines = [f"Line {i} " + "x" * 60 for i in range(200)]
+    text = prepare_prompt_text("\n".join(lines), 1000)
+    assert text.endswith("x\n[truncated]")
+    assert len(text) > 0.85 * 4000
@@ -0,0 +1,74 @@
+import json
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from groq import RateLimitError
+
+import app as hirevoid
+
+class FakeCompletions:
+    """Stands in for client.chat.completions; fails with 429 while rate_limited is set"""
+
+    def __init__(self):
+        self.calls = 0
+        self.rate_limited = False
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.rate_limited:
+            response = SimpleNamespace(status_code=429, headers={'retry-after': '7'}, request=None)
+            raise RateLimitError("rate limited", response=response, body=None)
+        content = json.dumps({'overview': f"call {self.calls}"})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+@pytest.fixture
+def completions(monkeypatch):
+    fake = FakeCompletions()
+    monkeypatch.setattr(hirevoid, 'client', SimpleNamespace(chat=SimpleNamespace(completions=fake)))
+    return fake
+
+@pytest.fixture
+def client():
+    with hirevoid.app.app_context():
+        hirevoid.upgrade_schema()
+        user = hirevoid.User(email=f"{uuid.uuid4().hex}@example.com")
+        hirevoid.db.session.add(user)
+        hirevoid.db.session.commit()
+        user_id = user.id
+    test_client = hirevoid.app.test_client()
+    with test_client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    return test_client
+
+def analyze(client, jd, key):
+    return client.post('/api/analyze-jd', json={'jd': jd}, headers={'Idempotency-Key': key})
+
+def test_idempotent_retry_replays_the_first_result(client, completions):
+    first = analyze(client, 'Kotlin developer', 'replay')
+    second = analyze(client, 'Kotlin developer', 'replay')
+    assert first.status_code == second.status_code == 200
+    assert first.get_json() == second.get_json()
+    assert first.headers['X-Job-ID'] == second.headers['X-Job-ID']
+    assert completions.calls == 1
+
+def test_key_reuse_with_a_different_body_is_rejected(client, completions):
+    assert analyze(client, 'Python developer', 'reuse').status_code == 200
+    response = analyze(client, 'Go developer', 'reuse')
+    assert response.status_code == 422
+    assert completions.calls == 1
+
+def test_retry_after_a_rate_limit_runs_again(client, completions):
+    completions.rate_limited = True
+    first = analyze(client, 'Rust developer', 'after-429')
+    assert first.status_code == 429
+    assert first.headers['Retry-After'] == str(first.get_json()['retryAfter'])
+    calls = completions.calls
+
+    hirevoid.groq_gate.resume_at = 0
+    completions.rate_limited = False
+    second = analyze(client, 'Rust developer', 'after-429')
+    assert second.status_code == 200
+    assert completions.calls == calls + 1
+    assert second.headers['X-Job-ID'] != first.headers['X-Job-ID']
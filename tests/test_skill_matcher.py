@@ -0,0 +1,70 @@
+import pytest
+
+from app import SKILL_SYNONYMS, SkillMatcher
+
+@pytest.fixture(scope="module")
+def matcher():
+    return SkillMatcher(SKILL_SYNONYMS)
+
+def match(matcher, skills, text):
+    return matcher.match(skills, matcher.profile(text))
+
+def test_respects_word_boundaries(matcher):
+    matched, missing = match(matcher, ["Go"], "Worked at Google on search ranking")
+    assert matched == []
+    assert missing == ["Go"]
+
+def test_synonyms_fold_both_ways(matcher):
+    matched, _ = match(matcher, ["JavaScript", "Kubernetes"], "Built SPAs in JS (ES6) and ran them on k8s")
+    assert matched == ["JavaScript", "Kubernetes"]
+    matched, _ = match(matcher, ["k8s"], "Deployed services to Kubernetes")
+    assert matched == ["k8s"]
+
+def test_multi_word_synonym(matcher):
+    matched, _ = match(matcher, ["AWS"], "Five years on Amazon Web Services")
+    assert matched == ["AWS"]
+
+@pytest.mark.parametrize("skill", [
+    "Amazon Web Services (AWS)",
+    "Google Cloud Platform (GCP)",
+    "Microsoft Azure DevOps Services",
+])
+def test_skills_longer_than_ngram_window(matcher, skill):
+    matched, missing = match(matcher, [skill], f"Certified in {skill} and Terraform.")
+    assert matched == [skill]
+    assert missing == []
+
+def test_long_skill_needs_contiguous_tokens(matcher):
+    _, missing = match(matcher, ["Microsoft Azure DevOps Services"],
+                       "Microsoft Azure for hosting, DevOps practices, customer services")
+    assert missing == ["Microsoft Azure DevOps Services"]
+
+def test_punctuation_and_case_are_ignored(matcher):
+    matched, _ = match(matcher, ["Node.js", "C++", "CI/CD"], "node.js APIs, c++ tooling and ci cd pipelines")
+    assert matched == ["Node.js", "C++", "CI/CD"]
+
+def test_empty_inputs(matcher):
+    assert match(matcher, [], "anything") == ([], [])
+    assert match(matcher, ["Python"], "") == ([], ["Python"])
+
+@pytest.mark.parametrize("skill, text", [
+    ("REST API", "I took a rest between contracts"),
+    ("Node.js", "Implemented graph algorithms over weighted nodes and each node's edges"),
+    ("TypeScript", "Holds an active TS/SCI clearance"),
+])
+def test_plain_words_are_not_skill_aliases(matcher, skill, text):
+    assert match(matcher, [skill], text) == ([], [skill])
+
+def test_plain_words_do_not_count_as_local_match_skills():
+    from app import local_match
+    result = local_match("I took a rest and studied graph node layouts", "Needs REST API and Node.js experience")
+    assert result['matchedSkills'] == []
+    assert result['missingSkills'] == ['node.js', 'rest api']
+
+@pytest.mark.parametrize("skill, text", [
+    ("REST API", "Designed RESTful services"),
+    ("REST API", "Built REST APIs in Flask"),
+    ("Node.js", "Backend in NodeJS"),
+])
+def test_unambiguous_aliases_still_match(matcher, skill, text):
+    assert match(matcher, [skill], text) == ([skill], [])